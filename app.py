@@ -1,96 +1,167 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-from scipy.optimize import curve_fit
-import plotly.graph_objects as go
+
+from cache import LRUCache, content_hash
+from data_io import UPLOAD_TYPES
+from instrumentation import debug_panel, session_profiler
+from jobs import cancel_job, current_job, job_result, submit_job
 
 st.title("Data Regression App")
 
-uploaded_file = st.file_uploader("Upload a CSV file with two columns (independent and dependent variables)", type="csv")
+# Opt-in latency/payload profiling (EC_PROFILE=1 or ?profile=1)
+profiler = session_profiler("regression")
 
-if uploaded_file is not None:
-    df = pd.read_csv(uploaded_file)
-    if df.shape[1] != 2:
-        st.error("The CSV file must have exactly two columns.")
-    else:
-        x_col, y_col = df.columns
-        x = df[x_col].values
-        y = df[y_col].values
+# Parsed uploads and fit results shared across reruns and sessions, keyed on the
+# file's content hash (plus the model name for fits)
+@st.cache_resource
+def regression_cache():
+    return LRUCache(max_entries=64, max_bytes=512 * 2**20)
 
-        model_options = [
-            "Linear", "Quadratic", "Cubic",
-            "Power Law", "Exponential", "Logarithmic"
-        ]
-        selected_model = st.selectbox("Select the equation form", model_options)
-
-        # Define fitting functions
-        def linear_func(x, a, b):
-            return a * x + b
+cache = regression_cache()
 
-        def quadratic_func(x, a, b, c):
-            return a * x**2 + b * x + c
+# Polynomial fit state of one upload, read in chunks; cached per upload (the
+# file object itself is not hashed)
+@st.cache_data(max_entries=16, show_spinner="Reading file...")
+def chunked_fit(file_id, _file, model_name):
+    from data_io import iter_columns
+    from regression import fit_chunks
 
-        def cubic_func(x, a, b, c, d):
-            return a * x**3 + b * x**2 + c * x + d
+    return fit_chunks(iter_columns(_file, [0, 1]), model_name)
 
-        def power_law_func(x, a, b):
-            return a * x**b
+if st.checkbox("Chunked fit: read the files in chunks and accumulate a polynomial fit (bounded memory)"):
+    import pandas as pd
+    import plotly.graph_objects as go
 
-        def exponential_func(x, a, b):
-            return a * np.exp(b * x)
+    from data_io import columns_of
+    from plotting import line_trace
+    from regression import IncrementalPolyFit, polynomial_models
 
-        def logarithmic_func(x, a, b):
-            return a + b * np.log(x)
+    uploaded_files = st.file_uploader("Upload CSV, Parquet or Feather files with the same first two columns "
+                                      "(independent and dependent variables); files added later update the fit",
+                                      type=UPLOAD_TYPES, accept_multiple_files=True)
+    selected_model = st.selectbox("Select the equation form", polynomial_models)
+    if uploaded_files:
+        try:
+            # Only new files are read; the per-file states are merged
+            with profiler.timed("fit"):
+                fits = [chunked_fit(f.file_id, f, selected_model) for f in uploaded_files]
+                fit = IncrementalPolyFit(fits[0].degree)
+                for file_fit in fits:
+                    fit.merge(file_fit)
+                result = fit.result()
+        except Exception as e:
+            st.error(f"Error fitting the model: {str(e)}")
+        else:
+            st.dataframe(pd.DataFrame({"File": [f.name for f in uploaded_files],
+                                       "Points": [file_fit.n for file_fit in fits]}), hide_index=True)
+            x_col, y_col = columns_of(uploaded_files[0])[:2]
+            with profiler.timed("plot build"):
+                x_grid = np.linspace(fit.x_min, fit.x_max, 1000)
+                fig = go.Figure()
+                fig.add_trace(line_trace(x_grid, np.polyval(result["params"], x_grid), 'Fitted Curve'))
+                fig.update_layout(title='Fitted Curve', xaxis_title=x_col, yaxis_title=y_col)
+            st.plotly_chart(profiler.payload("figure", fig))
+            st.latex(result["latex_eq"])
+            st.write(f"R²: {result['r2']:.4f} ({result['n']} points)")
+    debug_panel(profiler, caches={"regression": cache})
+    st.stop()
+
+uploaded_file = st.file_uploader("Upload a CSV, Parquet or Feather file with the independent and dependent variables",
+                                 type=UPLOAD_TYPES)
 
-        # Mapping of models to functions and LaTeX bases
-        model_map = {
-            "Linear": (linear_func, r"y = ax + b", [1.0, 1.0], True),
-            "Quadratic": (quadratic_func, r"y = ax^2 + bx + c", [1.0, 1.0, 1.0], True),
-            "Cubic": (cubic_func, r"y = ax^3 + bx^2 + cx + d", [1.0, 1.0, 1.0, 1.0], True),
-            "Power Law": (power_law_func, r"y = a x^{b}", [1.0, 1.0], False),
-            "Exponential": (exponential_func, r"y = a e^{bx}", [1.0, 0.1], False),
-            "Logarithmic": (logarithmic_func, r"y = a + b \ln(x)", [1.0, 1.0], False)
-        }
+if uploaded_file is not None:
+    # pandas, SciPy and Plotly load on the first upload rather than at cold start
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    from data_io import columns_of, read_table
+    from plotting import band_trace, line_trace, scatter_trace
+    from regression import bootstrap_fit, fit_all_models, fit_model, model_map
+
+    # Only the two selected columns are read (columnar files decode nothing else)
+    columns = columns_of(uploaded_file)
+    if len(columns) > 2:
+        col1, col2 = st.columns(2)
+        columns = [col1.selectbox("Independent variable", columns, index=0),
+                   col2.selectbox("Dependent variable", columns, index=1)]
+    if len(columns) < 2:
+        st.error("The file must have at least two columns.")
+    elif columns[0] == columns[1]:
+        st.error("Select two different columns.")
+    else:
+        x_col, y_col = columns
+        data_key = (content_hash(uploaded_file.getbuffer()), x_col, y_col)
+        with profiler.timed("parse"):
+            df = cache.get_or_compute(("data", data_key), lambda: read_table(uploaded_file, columns))
+        x = df[x_col].values
+        y = df[y_col].values
 
-        func, latex_base, p0, use_polyfit = model_map[selected_model]
+        # Fits run in the background (one per session: changing the mode, model or
+        # data cancels the running one), with their results in the shared cache
+        mode = st.radio("Mode", ["Single model", "Fit all models"], horizontal=True)
+        if mode == "Fit all models":
+            cancel_job("bootstrap")
+
+            def fit_all(progress):
+                results, table = fit_all_models(x, y, progress=progress)
+                # Seed the single-model entries so switching back is instant
+                for name, result in results.items():
+                    if "error" not in result:
+                        cache.put(("fit", data_key, name), result)
+                return results, table
+
+            # Failed models are listed in the table; this catches failures of the
+            # run itself (e.g. a crashed worker process) and of the plot
+            try:
+                job = submit_job("fit", ("fit_all", data_key),
+                                 lambda progress: cache.get_or_compute(("fit_all", data_key),
+                                                                       lambda: fit_all(progress)))
+                with profiler.timed("fit all"):
+                    fitted = job_result(job, "Fitting all models")
+                if fitted is not None:
+                    results, table = fitted
+                    st.dataframe(table)
+
+                    with profiler.timed("plot build"):
+                        fig = go.Figure()
+                        fig.add_trace(scatter_trace(x, y, 'Raw Data'))
+                        sort_idx = np.argsort(x)
+                        for name in table["Model"]:
+                            if "error" not in results[name]:
+                                fig.add_trace(line_trace(x[sort_idx], results[name]["y_fit"][sort_idx], name))
+                        fig.update_layout(title='Data and Fitted Curves', xaxis_title=x_col, yaxis_title=y_col)
+                    st.plotly_chart(profiler.payload("figure", fig))
+            except Exception as e:
+                st.error(f"Error fitting the models: {str(e)}")
+            debug_panel(profiler, caches={"regression": cache})
+            st.stop()
+
+        model_options = list(model_map)
+        selected_model = st.selectbox("Select the equation form", model_options)
+        bootstrap = st.checkbox("Bootstrap confidence and prediction bands")
+        if bootstrap:
+            col1, col2 = st.columns(2)
+            n_resamples = int(col1.number_input("Resamples", min_value=100, max_value=10_000, value=2000, step=100))
+            level = col2.selectbox("Confidence level", [0.90, 0.95, 0.99], index=1, format_func=lambda v: f"{v:.0%}")
+            boot_key = ("bootstrap", data_key, selected_model, n_resamples, level)
+            # A bootstrap for other inputs stops now, not once the new fit has finished
+            current_job("bootstrap", boot_key)
+        else:
+            cancel_job("bootstrap")
 
         try:
-            if use_polyfit:
-                # Use np.polyfit for polynomials
-                degree = len(p0) - 1
-                coeffs = np.polyfit(x, y, degree)
-                y_fit = np.polyval(coeffs, x)
-                # Build LaTeX equation
-                terms = []
-                for i, coeff in enumerate(coeffs):
-                    if coeff != 0:
-                        power = degree - i
-                        if power == 0:
-                            terms.append(f"{coeff:.4f}")
-                        elif power == 1:
-                            terms.append(f"{coeff:.4f}x")
-                        else:
-                            terms.append(f"{coeff:.4f}x^{{{power}}}")
-                latex_eq = r"y = " + " + ".join(terms).replace("+ -", "- ")
-            else:
-                # Use curve_fit for non-linear models
-                popt, _ = curve_fit(func, x, y, p0=p0)
-                y_fit = func(x, *popt)
-                # Build LaTeX equation
-                params = [f"{param:.4f}" for param in popt]
-                if selected_model == "Power Law":
-                    latex_eq = r"y = " + params[0] + r" x^{" + params[1] + r"}"
-                elif selected_model == "Exponential":
-                    latex_eq = r"y = " + params[0] + r" e^{" + params[1] + r"x}"
-                elif selected_model == "Logarithmic":
-                    latex_eq = r"y = " + params[0] + r" + " + params[1] + r" \ln(x)"
-                else:
-                    latex_eq = latex_base  # Fallback
-
-            # Calculate R^2
-            ss_res = np.sum((y - y_fit)**2)
-            ss_tot = np.sum((y - np.mean(y))**2)
-            r2 = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
+            # Non-linear fits report each function evaluation, so they can be cancelled
+            job = submit_job("fit", ("fit", data_key, selected_model),
+                             lambda progress: cache.get_or_compute(("fit", data_key, selected_model),
+                                                                   lambda: fit_model(x, y, selected_model, progress)))
+            with profiler.timed("fit"):
+                fit = job_result(job, "Fitting")
+            if fit is None:
+                debug_panel(profiler, caches={"regression": cache})
+                st.stop()
+            y_fit = fit["y_fit"]
+            latex_eq = fit["latex_eq"]
+            r2 = fit["r2"]
 
             # Prepare plot
             # Sort for smooth line
@@ -98,16 +169,47 @@ if uploaded_file is not None:
             x_sorted = x[sort_idx]
             y_fit_sorted = y_fit[sort_idx]
 
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(x=x, y=y, mode='markers', name='Raw Data'))
-            fig.add_trace(go.Scatter(x=x_sorted, y=y_fit_sorted, mode='lines', name='Fitted Curve'))
-            fig.update_layout(title='Data and Fitted Curve', xaxis_title=x_col, yaxis_title=y_col)
-
-            st.plotly_chart(fig)
+            # The fit is shown while the bands are computed
+            boot = None
+            if bootstrap:
+                job = submit_job("bootstrap", boot_key,
+                                 lambda progress: cache.get_or_compute(
+                                     boot_key, lambda: bootstrap_fit(x, y, selected_model, n_resamples, level,
+                                                                     progress=progress)))
+                with profiler.timed("bootstrap"):
+                    try:
+                        boot = job_result(job, "Bootstrapping")
+                    except ValueError as e:
+                        # The fit itself is still shown, without bands
+                        st.warning(str(e))
+
+            with profiler.timed("plot build"):
+                fig = go.Figure()
+                if boot is not None:
+                    fig.add_trace(band_trace(boot["x"], *boot["prediction"], f"{level:.0%} prediction band",
+                                             fillcolor="rgba(99, 110, 250, 0.12)"))
+                    fig.add_trace(band_trace(boot["x"], *boot["confidence"], f"{level:.0%} confidence band",
+                                             fillcolor="rgba(99, 110, 250, 0.3)"))
+                # Decimated server-side, so large uploads stay responsive in the browser
+                fig.add_trace(scatter_trace(x, y, 'Raw Data'))
+                fig.add_trace(line_trace(x_sorted, y_fit_sorted, 'Fitted Curve'))
+                fig.update_layout(title='Data and Fitted Curve', xaxis_title=x_col, yaxis_title=y_col)
+
+            st.plotly_chart(profiler.payload("figure", fig))
 
             st.latex(latex_eq)
             st.write(f"R²: {r2:.4f}")
+            if boot is not None:
+                lower, upper = boot["param_ci"]
+                st.dataframe(pd.DataFrame({"Parameter": list("abcd"[:len(fit["params"])]), "Estimate": fit["params"],
+                                           f"{level:.0%} lower": lower, f"{level:.0%} upper": upper}),
+                             hide_index=True)
+                skipped = boot["n_requested"] - boot["n_resamples"]
+                st.caption(f"Percentile intervals from {boot['n_resamples']} bootstrap resamples"
+                           + (f" ({skipped} did not converge and were dropped)." if skipped else "."))
 
         except Exception as e:
             st.error(f"Error fitting the model: {str(e)}")
             st.write("Please ensure the data is suitable for the selected model (e.g., positive x for log/power).")
+
+debug_panel(profiler, caches={"regression": cache})
@@ -0,0 +1,92 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from data_io import columns_of, iter_frames
+from engine import CALCULATIONS
+from units import from_si, si_unit, to_si
+
+
+# Stream an input file (CSV, or Parquet/Feather read memory-mapped) through one
+# engine calculation in chunks and append the results to the output CSV as each
+# chunk finishes, so memory is bounded by the chunk size rather than the file size.
+#   columns:      input name -> CSV column (defaults to the input name)
+#   units:        input/output name -> unit (defaults to SI)
+#   passthrough:  copy the input columns into the output file
+def run_csv(calculation, input_path, output_path, chunksize=100_000, columns=None,
+            units=None, passthrough=True):
+    if calculation not in CALCULATIONS:
+        raise ValueError(f"Unknown calculation: {calculation}")
+    spec = CALCULATIONS[calculation]
+    columns = {name: (columns or {}).get(name, name) for name in spec["inputs"]}
+    units = units or {}
+
+    def unit_of(name, dimension):
+        return units.get(name, si_unit(dimension)) if dimension else None
+
+    output_names = {name: f"{name} ({unit_of(name, dim)})" if dim else name
+                    for name, dim in spec["outputs"].items()}
+
+    available = columns_of(input_path)
+    missing = [col for col in columns.values() if col not in available]
+    if missing:
+        raise ValueError(f"Missing columns in {input_path}: {', '.join(missing)}")
+
+    rows = 0
+    reader = iter_frames(input_path, None if passthrough else list(dict.fromkeys(columns.values())), chunksize)
+    with open(output_path, "w", newline="") as out:
+        for i, chunk in enumerate(reader):
+            # Convert each input column to SI, compute, convert outputs back
+            inputs = {name: to_si(chunk[col].to_numpy(dtype=float), unit_of(name, spec["inputs"][name]),
+                                  spec["inputs"][name])
+                      for name, col in columns.items()}
+            results = spec["compute"](**inputs)
+
+            frame = chunk if passthrough else pd.DataFrame(index=chunk.index)
+            for name, dimension in spec["outputs"].items():
+                values = np.broadcast_to(results[name], len(chunk))
+                if dimension:
+                    values = from_si(values, unit_of(name, dimension), dimension)
+                frame[output_names[name]] = values
+            frame.to_csv(out, header=(i == 0), index=False)
+            rows += len(chunk)
+    return rows
+
+
+# NAME=VALUE command-line arguments as a dict (also used by the sweep runner)
+def parse_pairs(pairs):
+    parsed = {}
+    for pair in pairs or []:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Expected NAME=VALUE, got {pair}")
+        parsed[key] = value
+    return parsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run an engineering calculation over a CSV file in chunks.")
+    parser.add_argument("calculation", choices=sorted(CALCULATIONS))
+    parser.add_argument("input", help="input CSV, Parquet or Feather path")
+    parser.add_argument("output", help="output CSV path")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows per chunk")
+    parser.add_argument("--column", action="append", metavar="NAME=COLUMN",
+                        help="map an input to a CSV column (repeatable)")
+    parser.add_argument("--unit", action="append", metavar="NAME=UNIT",
+                        help="unit of an input or output column (repeatable, default SI)")
+    parser.add_argument("--no-passthrough", action="store_true",
+                        help="write only the result columns")
+    args = parser.parse_args(argv)
+
+    try:
+        rows = run_csv(args.calculation, args.input, args.output, chunksize=args.chunksize,
+                       columns=parse_pairs(args.column), units=parse_pairs(args.unit),
+                       passthrough=not args.no_passthrough)
+    except (ValueError, argparse.ArgumentTypeError) as e:
+        parser.error(str(e))
+    print(f"Wrote {rows} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
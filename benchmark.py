@@ -0,0 +1,236 @@
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+from scipy.stats import gaussian_kde
+
+from kde_engine import binned_kde, compute_bandwidth, gaussian_kernel, kde_bin_masses, kde_func
+from regression import bootstrap_fit, fit_chunks, fit_model
+from settling import settling_adaptive, settling_batch, settling_euler
+from steam import default_table, saturation_temperature
+
+# Input sizes run by default (10^2 ... 10^7); each case skips sizes above its max_n
+SIZES = [10**k for k in range(2, 8)]
+# Points at which the KDE paths are evaluated, as in the apps
+EVAL_POINTS = 1000
+# A case slower than its baseline by more than this fraction is a regression,
+# unless the slowdown is below the noise floor (s)
+THRESHOLD = 0.25
+NOISE_FLOOR = 1e-3
+# Likewise for peak memory: more than this fraction above the baseline, and by
+# more than the memory noise floor (bytes), is a regression
+MEMORY_THRESHOLD = 0.5
+MEMORY_NOISE_FLOOR = 2**20
+# Timed runs per size (the best is kept); fewer let scheduler noise through as
+# false regressions
+REPEAT = 5
+
+
+def _kde_data(n, rng):
+    data = rng.normal(size=n)
+    return data, compute_bandwidth(data, "silverman")
+
+
+def _regression_data(n, rng):
+    x = np.linspace(1, 10, n)
+    return x, 2.0 * x**1.5 + rng.normal(0, 0.5, n)
+
+
+def _particles(n, rng):
+    return (10 ** rng.uniform(-4, -2, n), rng.uniform(1500, 8000, n),
+            np.full(n, 1000.0), np.full(n, 1e-3))
+
+
+def _settle_each(solver, d_m, rho_p, rho_f, mu):
+    for args in zip(d_m, rho_p, rho_f, mu):
+        solver(*args)
+
+
+# Rows per chunk of the incremental polynomial fit
+FIT_CHUNK = 100_000
+
+
+def _chunks(x, y, size=FIT_CHUNK):
+    return ((x[i:i + size], y[i:i + size]) for i in range(0, len(x), size))
+
+
+# Benchmark cases: setup(n, rng) builds the inputs (not timed), run(*inputs) is
+# the timed call. max_n caps paths whose cost makes the largest sizes impractical.
+CASES = {
+    "kde_exact": {
+        "setup": lambda n, rng: (np.linspace(-4, 4, EVAL_POINTS), *_kde_data(n, rng)),
+        "run": lambda x, data, h: kde_func(x, data, h, gaussian_kernel),
+        "max_n": 10**6,
+    },
+    "kde_binned": {
+        "setup": lambda n, rng: _kde_data(n, rng),
+        "run": lambda data, h: binned_kde(data, h, "Gaussian", data.min() - 4 * h, data.max() + 4 * h),
+        "max_n": 10**7,
+    },
+    "kde_histogram_export": {
+        "setup": lambda n, rng: (np.linspace(-4, 4, 21), *_kde_data(n, rng)),
+        "run": lambda bins, data, h: kde_bin_masses(bins, data, h, "Gaussian"),
+        "max_n": 10**7,
+    },
+    "gaussian_kde_eval": {
+        "setup": lambda n, rng: (np.linspace(-4, 4, EVAL_POINTS), rng.normal(size=n)),
+        "run": lambda x, data: gaussian_kde(data)(x),
+        "max_n": 10**6,
+    },
+    "fit_polynomial": {
+        "setup": _regression_data,
+        "run": lambda x, y: fit_model(x, y, "Cubic"),
+        "max_n": 10**7,
+    },
+    "fit_polynomial_chunked": {
+        "setup": _regression_data,
+        "run": lambda x, y: fit_chunks(_chunks(x, y), "Cubic").result(),
+        "max_n": 10**7,
+    },
+    "bootstrap_polynomial": {
+        "setup": _regression_data,
+        "run": lambda x, y: bootstrap_fit(x, y, "Cubic", n_resamples=2000),
+        "max_n": 10**5,
+    },
+    "fit_curve_fit": {
+        "setup": _regression_data,
+        "run": lambda x, y: fit_model(x, y, "Power Law"),
+        "max_n": 10**7,
+    },
+    # The legacy loop never converges for particles whose terminal Re_p sits on
+    # the C_D jump at 1000; the seeded sample of 100 particles contains none
+    "settling_euler": {
+        "setup": _particles,
+        "run": lambda *particles: _settle_each(settling_euler, *particles),
+        "max_n": 10**2,
+    },
+    "settling_adaptive": {
+        "setup": _particles,
+        "run": lambda *particles: _settle_each(settling_adaptive, *particles),
+        "max_n": 10**3,
+    },
+    "settling_batch": {
+        "setup": _particles,
+        "run": settling_batch,
+        "max_n": 10**7,
+    },
+    "steam_if97": {
+        "setup": lambda n, rng: (10 ** rng.uniform(3, 7, n),),
+        "run": saturation_temperature,
+        "max_n": 10**7,
+    },
+    "steam_table": {
+        "setup": lambda n, rng: (default_table(), 10 ** rng.uniform(3, 7, n)),
+        "run": lambda table, p: table(p),
+        "max_n": 10**7,
+    },
+}
+
+
+# Run one case at one size: the best wall time over `repeat` runs, and the peak
+# traced allocation of a separate run under tracemalloc (NumPy reports its
+# buffers to tracemalloc, so array temporaries are included)
+def run_case(name, n, repeat=REPEAT, seed=0):
+    case = CASES[name]
+    inputs = case["setup"](n, np.random.default_rng(seed))
+
+    tracemalloc.start()
+    case["run"](*inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case["run"](*inputs)
+        times.append(time.perf_counter() - start)
+    return {"case": name, "n": n, "seconds": min(times), "peak_bytes": peak}
+
+
+def run_suite(cases=None, sizes=SIZES, repeat=REPEAT, progress=None):
+    results = []
+    for name in cases or CASES:
+        for n in sizes:
+            if n > CASES[name]["max_n"]:
+                continue
+            result = run_case(name, n, repeat=repeat)
+            results.append(result)
+            if progress:
+                progress(result)
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+        },
+        "results": results,
+    }
+
+
+# Compare a run against a baseline run, matched on (case, n). Returns one row per
+# common entry with time and memory ratios (current / baseline) and whether
+# either ratio exceeds 1 + its threshold by more than its noise floor.
+def compare(current, baseline, threshold=THRESHOLD, noise_floor=NOISE_FLOOR,
+            memory_threshold=MEMORY_THRESHOLD, memory_noise_floor=MEMORY_NOISE_FLOOR):
+    base = {(r["case"], r["n"]): r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        b = base.get((r["case"], r["n"]))
+        if b is None:
+            continue
+        time_ratio = r["seconds"] / b["seconds"] if b["seconds"] > 0 else np.inf
+        memory_ratio = r["peak_bytes"] / b["peak_bytes"] if b["peak_bytes"] > 0 else np.inf
+        slower = time_ratio > 1 + threshold and r["seconds"] - b["seconds"] > noise_floor
+        larger = (memory_ratio > 1 + memory_threshold
+                  and r["peak_bytes"] - b["peak_bytes"] > memory_noise_floor)
+        rows.append({"case": r["case"], "n": r["n"], "time_ratio": time_ratio,
+                     "memory_ratio": memory_ratio, "regression": slower or larger})
+    return rows
+
+
+def _format_result(r):
+    return f"{r['case']:<22} n={r['n']:<9} {r['seconds'] * 1e3:10.2f} ms {r['peak_bytes'] / 2**20:10.2f} MiB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the numerical paths of the apps.")
+    parser.add_argument("--case", action="append", choices=sorted(CASES),
+                        help="case to run (repeatable, default all)")
+    parser.add_argument("--max-n", type=float, default=max(SIZES), help="largest input size to run")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="timed runs per size (best is kept)")
+    parser.add_argument("--output", default="bench_output.json", help="JSON file for the results")
+    parser.add_argument("--baseline", help="JSON file of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="allowed slowdown vs the baseline as a fraction (default 0.25)")
+    parser.add_argument("--memory-threshold", type=float, default=MEMORY_THRESHOLD,
+                        help="allowed peak-memory growth vs the baseline as a fraction (default 0.5)")
+    args = parser.parse_args(argv)
+
+    sizes = [n for n in SIZES if n <= args.max_n]
+    report = run_suite(args.case, sizes, repeat=args.repeat, progress=lambda r: print(_format_result(r)))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold, memory_threshold=args.memory_threshold)
+        regressions = [row for row in rows if row["regression"]]
+        for row in regressions:
+            print(f"REGRESSION {row['case']} n={row['n']}: {row['time_ratio']:.2f}x time, "
+                  f"{row['memory_ratio']:.2f}x memory")
+        print(f"{len(rows)} compared, {len(regressions)} regressions (thresholds {args.threshold:.0%} time, "
+              f"{args.memory_threshold:.0%} memory)")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import importlib
+
+# Calculator categories shown in the sidebar tree
+CATEGORIES = {
+    "Geometry": ["Sphere Mass Calculator", "Cylinder Volume Calculator"],
+    "Thermodynamics": ["Steam Saturation Temperature Calculator"],
+    "Particles": ["Particle Settling Velocity Calculator"]
+}
+
+# Module implementing each calculator as render(profiler). Modules are imported
+# the first time their calculator is selected, so their dependencies (SciPy for
+# the settling solver, pandas for CSV batches) load only then.
+MODULES = {
+    "Sphere Mass Calculator": "calculators.sphere_mass",
+    "Cylinder Volume Calculator": "calculators.cylinder_volume",
+    "Steam Saturation Temperature Calculator": "calculators.steam_saturation_temperature",
+    "Particle Settling Velocity Calculator": "calculators.particle_settling"
+}
+
+
+# Render function of a calculator, importing its module on first use
+def load(name):
+    return importlib.import_module(MODULES[name]).render
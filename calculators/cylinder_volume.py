@@ -0,0 +1,66 @@
+import streamlit as st
+
+from calculators.results import cached
+from calculators.sweep_mode import render_sweep
+from engine import cylinder_volume
+from units import from_si, to_si
+
+
+def render(profiler):
+    # LaTeX equation and nomenclature
+    st.markdown("### Equation")
+    st.markdown("The volume of the cylinder is calculated using the following equation:")
+    st.latex(r"V = \pi \left( \frac{d}{2} \right)^2 h")
+
+    st.markdown("### Nomenclature")
+    st.markdown(r"""
+    - $V$: Volume of the cylinder  
+    - $d$: Diameter of the cylinder  
+    - $h$: Height of the cylinder
+    """)
+
+    # Define unit options (SI first, then smallest to largest)
+    length_units = ["m", "micron", "mm", "cm", "in", "ft"]
+    volume_units = ["m³", "cm³", "in³", "ft³"]
+
+    # Mode: one point from the inputs below, or a grid of values of each input
+    mode = st.radio("Mode", ["Single point", "Sweep"], horizontal=True, key="cylinder_mode")
+    if mode == "Sweep":
+        render_sweep("cylinder_volume",
+                     units={"diameter": length_units, "height": length_units, "volume": volume_units},
+                     defaults={"diameter": "0.1:1:10", "height": "0.5, 1, 2"},
+                     labels={"diameter": "Cylinder Diameter", "height": "Cylinder Height", "volume": "Volume"},
+                     profiler=profiler, key="cylinder_sweep")
+        return
+
+    # Layout inputs using columns
+    # Row 1: Height
+    col7, col8 = st.columns([2, 1])
+    with col7:
+        height = st.number_input("Cylinder Height", min_value=0.0, value=1.0, step=0.1, key="cylinder_height")
+    with col8:
+        height_unit = st.selectbox("Height Unit", length_units, index=0, key="cylinder_height_unit")
+
+    # Row 2: Diameter
+    col9, col10 = st.columns([2, 1])
+    with col9:
+        diameter_cyl = st.number_input("Cylinder Diameter", min_value=0.0, value=1.0, step=0.1, key="cylinder_diameter")
+    with col10:
+        diameter_unit_cyl = st.selectbox("Diameter Unit", length_units, index=0, key="cylinder_diameter_unit")
+
+    # Row 3: Volume output unit
+    col11, col12 = st.columns([2, 1])
+    with col11:
+        volume_unit = st.selectbox("Volume Output Unit", volume_units, index=0, key="cylinder_volume_unit")
+
+    # Calculate volume
+    if st.button("Calculate", key="cylinder_calculate"):
+        if height <= 0 or diameter_cyl <= 0:
+            st.error("Height and diameter must be positive values.")
+        else:
+            height_m = to_si(height, height_unit, "length")
+            diameter_m = to_si(diameter_cyl, diameter_unit_cyl, "length")
+            volume_m3 = cached("cylinder_volume", cylinder_volume, diameter_m, height_m)
+            volume_output = from_si(volume_m3, volume_unit, "volume")
+            with col11:
+                st.success(f"The volume of the cylinder is {volume_output:.4f} {volume_unit}")
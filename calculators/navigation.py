@@ -0,0 +1,48 @@
+import streamlit as st
+
+from calculators import CATEGORIES
+
+
+# Categories and calculators whose names contain the search term (case-insensitive)
+def filter_calculators(search_term, categories=CATEGORIES):
+    search_term = search_term.lower()
+    filtered_calculators = {}
+    for category, calc_list in categories.items():
+        filtered_list = [calc for calc in calc_list if search_term in calc.lower()]
+        if filtered_list:
+            filtered_calculators[category] = filtered_list
+    return filtered_calculators
+
+
+# Sidebar: search field and category tree; returns the selected calculator (or None)
+def render_sidebar():
+    st.sidebar.header("Calculator Navigation")
+
+    # Search field
+    search_term = st.sidebar.text_input("Search Calculators", "")
+
+    # Clear selection button
+    if st.sidebar.button("Clear Selection"):
+        st.session_state.selected_calculator = None
+
+    # Initialize session state for selected calculator
+    if "selected_calculator" not in st.session_state:
+        st.session_state.selected_calculator = None
+
+    # Display tree structure with expanders
+    filtered_calculators = filter_calculators(search_term)
+    if not filtered_calculators:
+        st.sidebar.write("No calculators match your search.")
+    else:
+        for category, calc_list in filtered_calculators.items():
+            with st.sidebar.expander(category):
+                for calc in calc_list:
+                    # Use a button for each calculator
+                    if st.button(calc, key=f"button_{calc}"):
+                        # Toggle selection: if already selected, deselect; otherwise, select
+                        if st.session_state.selected_calculator == calc:
+                            st.session_state.selected_calculator = None
+                        else:
+                            st.session_state.selected_calculator = calc
+
+    return st.session_state.selected_calculator
@@ -0,0 +1,230 @@
+from io import BytesIO
+
+import streamlit as st
+
+from calculators.results import cached
+from calculators.sweep_mode import render_sweep
+from data_io import UPLOAD_TYPES, columns_of, read_table
+from engine import particle_settling, particle_settling_batch
+from instrumentation import debug_panel
+from jobs import cancel_job, current_job, job_result, submit_job
+from units import from_si, to_si
+
+
+# Batch solve of an uploaded file, run as a background job: reads only the
+# input columns (diameter, particle density, fluid density, fluid viscosity, in
+# the given units) and returns them with the SI results
+def _solve_batch(file, columns, units, progress):
+    df = read_table(file, list(dict.fromkeys(columns)))
+    dimensions = ["length", "density", "density", "viscosity"]
+    results = particle_settling_batch(*(to_si(df[col].to_numpy(dtype=float), unit, dimension)
+                                        for col, unit, dimension in zip(columns, units, dimensions)),
+                                      progress=progress)
+    return df, results
+
+
+def render(profiler):
+    # Title and description
+    st.markdown("## Particle Settling Velocity")
+    st.markdown("This tool calculates the terminal settling velocity of a spherical particle")
+
+    # Define unit options (SI first, then smallest to largest)
+    length_units = ["m", "micron", "mm", "cm", "in", "ft"]
+    density_units = ["kg/m³", "g/cm³", "lb/ft³"]
+    viscosity_units = ["Pa·s", "cP", "lb/ft·s"]
+    time_units = ["s", "min", "hr"]
+    distance_units = ["m", "cm", "ft"]
+    velocity_units = ["m/s", "cm/s", "ft/s"]
+    dimensionless_units = ["Dimensionless"]
+
+    # Mode: one particle from the inputs below, one row per particle from a CSV,
+    # or a grid of values of each input
+    mode = st.radio("Mode", ["Single particle", "Batch (CSV)", "Sweep"], horizontal=True, key="particle_mode")
+    batch_mode = mode == "Batch (CSV)"
+    if not batch_mode:
+        cancel_job("particle_batch")
+    if mode == "Sweep":
+        render_sweep("particle_settling",
+                     units={"diameter": length_units, "particle_density": density_units,
+                            "fluid_density": density_units, "fluid_viscosity": viscosity_units,
+                            "v_t": velocity_units, "t": time_units, "z": distance_units},
+                     defaults={"diameter": "0.00001:0.01:200 log", "particle_density": "1500:8000:50",
+                               "fluid_density": "1000", "fluid_viscosity": "0.001"},
+                     labels={"diameter": "Particle Diameter", "particle_density": "Particle Density",
+                             "fluid_density": "Fluid Density", "fluid_viscosity": "Fluid Viscosity",
+                             "Re_p": "Particle Reynolds Number", "C_D": "Drag Coefficient",
+                             "v_t": "Terminal Velocity", "t": "Time to Terminal Velocity",
+                             "z": "Distance to Terminal Velocity"},
+                     profiler=profiler, key="particle_sweep")
+        return
+
+    # Inputs (in batch mode the left column names the CSV column instead)
+    # Row 1: Particle Diameter
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        if batch_mode:
+            diameter_col = st.text_input("Particle Diameter Column", value="diameter", key="particle_diameter_col")
+        else:
+            diameter = st.number_input("Particle Diameter", min_value=0.0, value=0.001, step=0.0001, key="particle_diameter")
+    with col2:
+        diameter_unit = st.selectbox("Diameter Unit", length_units, index=0, key="particle_diameter_unit")
+
+    # Row 2: Particle Density
+    col3, col4 = st.columns([2, 1])
+    with col3:
+        if batch_mode:
+            particle_density_col = st.text_input("Particle Density Column", value="particle_density", key="particle_density_col")
+        else:
+            particle_density = st.number_input("Particle Density", min_value=0.0, value=2500.0, step=10.0, key="particle_density")
+    with col4:
+        particle_density_unit = st.selectbox("Particle Density Unit", density_units, index=0, key="particle_density_unit")
+
+    # Row 3: Fluid Density
+    col5, col6 = st.columns([2, 1])
+    with col5:
+        if batch_mode:
+            fluid_density_col = st.text_input("Fluid Density Column", value="fluid_density", key="fluid_density_col")
+        else:
+            fluid_density = st.number_input("Fluid Density", min_value=0.0, value=1000.0, step=10.0, key="fluid_density")
+    with col6:
+        fluid_density_unit = st.selectbox("Fluid Density Unit", density_units, index=0, key="fluid_density_unit")
+
+    # Row 4: Fluid Viscosity
+    col7, col8 = st.columns([2, 1])
+    with col7:
+        if batch_mode:
+            fluid_viscosity_col = st.text_input("Fluid Viscosity Column", value="fluid_viscosity", key="fluid_viscosity_col")
+        else:
+            fluid_viscosity = st.number_input("Fluid Viscosity", min_value=0.0, value=0.001, step=0.0001, key="fluid_viscosity")
+    with col8:
+        fluid_viscosity_unit = st.selectbox("Fluid Viscosity Unit", viscosity_units, index=0, key="fluid_viscosity_unit")
+
+    # Outputs (non-editable text boxes with unit dropdowns)
+    # Row 5: Reynolds Number
+    col9, col10 = st.columns([2, 1])
+    reynolds_value = st.session_state.get("particle_reynolds", "")
+    with col9:
+        if not batch_mode:
+            st.text_input("Particle Reynolds Number at Terminal Velocity", value=str(reynolds_value), disabled=True, key="output_reynolds")
+    with col10:
+        reynolds_unit = st.selectbox("Reynolds Unit", dimensionless_units, index=0, key="reynolds_unit")
+
+    # Row 6: Drag Coefficient
+    col11, col12 = st.columns([2, 1])
+    drag_coeff_value = st.session_state.get("drag_coefficient", "")
+    with col11:
+        if not batch_mode:
+            st.text_input("Drag Coefficient at Terminal Velocity", value=str(drag_coeff_value), disabled=True, key="output_drag_coeff")
+    with col12:
+        drag_coeff_unit = st.selectbox("Drag Coefficient Unit", dimensionless_units, index=0, key="drag_coeff_unit")
+
+    # Row 7: Time to Terminal Velocity
+    col13, col14 = st.columns([2, 1])
+    time_value = st.session_state.get("time_to_terminal", "")
+    with col13:
+        if not batch_mode:
+            st.text_input("Time to Accelerate to Terminal Velocity", value=str(time_value), disabled=True, key="output_time")
+    with col14:
+        time_unit = st.selectbox("Time Unit", time_units, index=0, key="time_unit")
+
+    # Row 8: Distance Fallen
+    col15, col16 = st.columns([2, 1])
+    distance_value = st.session_state.get("distance_to_terminal", "")
+    with col15:
+        if not batch_mode:
+            st.text_input("Distance Fallen to Reach Terminal Velocity", value=str(distance_value), disabled=True, key="output_distance")
+    with col16:
+        distance_unit = st.selectbox("Distance Unit", distance_units, index=0, key="distance_unit")
+
+    # Row 9: Terminal Velocity
+    col17, col18 = st.columns([2, 1])
+    velocity_value = st.session_state.get("terminal_velocity", "")
+    with col17:
+        if not batch_mode:
+            st.text_input("Terminal Velocity", value=str(velocity_value), disabled=True, key="output_velocity")
+    with col18:
+        velocity_unit = st.selectbox("Velocity Unit", velocity_units, index=0, key="velocity_unit")
+
+    # Batch mode: vectorized solve over every row of the uploaded file (only the
+    # input columns are read)
+    if batch_mode:
+        uploaded_file = st.file_uploader("Upload a CSV, Parquet or Feather file with one particle per row",
+                                         type=UPLOAD_TYPES, key="particle_batch_file")
+        if uploaded_file is None:
+            cancel_job("particle_batch")
+            return
+        # Solved in the background; changing the file, the input columns or their
+        # units cancels the run (output units only change the display)
+        input_cols = [diameter_col, particle_density_col, fluid_density_col, fluid_viscosity_col]
+        input_units = [diameter_unit, particle_density_unit, fluid_density_unit, fluid_viscosity_unit]
+        key = (uploaded_file.file_id, *input_cols, *input_units)
+        if st.button("Calculate", key="particle_batch_calculate"):
+            available = columns_of(uploaded_file)
+            missing = [col for col in input_cols if col not in available]
+            if missing:
+                st.error(f"Missing columns in file: {', '.join(missing)}")
+                return
+            # The job reads its own copy of the upload, which the script keeps using
+            submit_job("particle_batch", key, _solve_batch, BytesIO(uploaded_file.getvalue()), input_cols,
+                       input_units, restart=True)
+        job = current_job("particle_batch", key)
+        if job is not None:
+            with profiler.timed("particle: compute"):
+                solved = job_result(job, "Calculating")
+            if solved is not None:
+                df, results = solved
+                output = df.copy()
+                output["Re_p"] = results["Re_p"].to_numpy()
+                output["C_D"] = results["C_D"].to_numpy()
+                output[f"t ({time_unit})"] = from_si(results["t"].to_numpy(), time_unit, "time")
+                output[f"z ({distance_unit})"] = from_si(results["z"].to_numpy(), distance_unit, "length")
+                output[f"v_t ({velocity_unit})"] = from_si(results["v_t"].to_numpy(), velocity_unit, "velocity")
+
+                invalid = int(results["v_t"].isna().sum())
+                if invalid:
+                    st.warning(f"{invalid} rows have non-positive inputs or a particle no denser than the fluid; their results are empty.")
+                st.write(f"Calculated {len(output)} particles.")
+                st.dataframe(profiler.payload("particle: table", output.head(1000)))
+                csv = profiler.payload("particle: download", output.to_csv(index=False).encode("utf-8"))
+                st.download_button("Download results CSV", csv, "settling_results.csv", "text/csv", key="particle_batch_download")
+        return
+
+    # Solver selection
+    solver = st.selectbox("Solver", ["Adaptive (root-finding + ODE)", "Fixed-step Euler (legacy)"],
+                          index=0, key="particle_solver")
+
+    # Calculate terminal velocity
+    if st.button("Calculate", key="particle_calculate"):
+        if diameter <= 0 or particle_density <= 0 or fluid_density <= 0 or fluid_viscosity <= 0:
+            st.error("All inputs must be positive values.")
+        elif particle_density <= fluid_density:
+            st.error("Particle density must be greater than fluid density for the particle to settle.")
+        else:
+            # Convert inputs to SI units
+            d_m = to_si(diameter, diameter_unit, "length")
+            rho_p = to_si(particle_density, particle_density_unit, "density")
+            rho_f = to_si(fluid_density, fluid_density_unit, "density")
+            mu = to_si(fluid_viscosity, fluid_viscosity_unit, "viscosity")
+
+            # Solve for terminal velocity, time and distance to reach it (once
+            # per set of SI inputs across all sessions)
+            try:
+                with profiler.timed("particle: compute"):
+                    result = cached("particle_settling", particle_settling, d_m, rho_p, rho_f, mu,
+                                    solver="adaptive" if solver == "Adaptive (root-finding + ODE)" else "euler")
+            except RuntimeError as e:
+                st.error(str(e))
+                return
+            Re_p, C_D = result["Re_p"], result["C_D"]
+            t, z, v = result["t"], result["z"], result["v_t"]
+
+            # Store results in session state for display
+            st.session_state.particle_reynolds = f"{Re_p:.4f}"
+            st.session_state.drag_coefficient = f"{C_D:.4f}"
+            st.session_state.time_to_terminal = f"{from_si(t, time_unit, 'time'):.4f}"
+            st.session_state.distance_to_terminal = f"{from_si(z, distance_unit, 'length'):.4f}"
+            st.session_state.terminal_velocity = f"{from_si(v, velocity_unit, 'velocity'):.4f}"
+
+            # Force re-render to update output fields (recording this run first)
+            debug_panel(profiler)
+            st.rerun()
@@ -0,0 +1,23 @@
+import os
+
+import streamlit as st
+
+from cache import LRUCache, si_key
+
+# Size limits of the shared result cache, overridable from the environment
+RESULT_CACHE_ENTRIES = int(os.environ.get("EC_RESULT_CACHE_ENTRIES", "10000"))
+RESULT_CACHE_MB = float(os.environ.get("EC_RESULT_CACHE_MB", "64"))
+
+
+# Calculator results shared by every session of the server, keyed on the
+# calculation and its SI inputs
+@st.cache_resource
+def result_cache():
+    return LRUCache(max_entries=RESULT_CACHE_ENTRIES, max_bytes=int(RESULT_CACHE_MB * 2**20))
+
+
+# func(*si_inputs, **options), computed once per calculation name and
+# normalized inputs. The cached value is shared: callers must not modify it.
+def cached(name, func, *si_inputs, **options):
+    key = si_key(name, *si_inputs, *sorted(options.items()))
+    return result_cache().get_or_compute(key, lambda: func(*si_inputs, **options))
@@ -0,0 +1,67 @@
+import streamlit as st
+
+from calculators.results import cached
+from calculators.sweep_mode import render_sweep
+from engine import sphere_mass
+from units import from_si, to_si
+
+
+def render(profiler):
+    # LaTeX equation and nomenclature
+    st.markdown("### Equation")
+    st.markdown("The mass of the sphere is calculated using the following equation:")
+    st.latex(r"m = \rho \cdot \frac{4}{3} \pi \left( \frac{d}{2} \right)^3")
+
+    st.markdown("### Nomenclature")
+    st.markdown(r"""
+    - $m$: Mass of the sphere  
+    - $\rho$: Density of the sphere  
+    - $d$: Diameter of the sphere
+    """)
+
+    # Define unit options (SI first, then smallest to largest)
+    diameter_units = ["m", "micron", "mm", "cm", "in", "ft"]
+    density_units = ["kg/m³", "g/cm³", "lb/ft³"]
+    mass_units = ["kg", "g", "lb"]
+
+    # Mode: one point from the inputs below, or a grid of values of each input
+    mode = st.radio("Mode", ["Single point", "Sweep"], horizontal=True, key="sphere_mode")
+    if mode == "Sweep":
+        render_sweep("sphere_mass",
+                     units={"diameter": diameter_units, "density": density_units, "mass": mass_units},
+                     defaults={"diameter": "0.1:1:10", "density": "1000, 2700, 7850"},
+                     labels={"diameter": "Sphere Diameter", "density": "Sphere Density", "mass": "Mass"},
+                     profiler=profiler, key="sphere_sweep")
+        return
+
+    # Layout inputs using columns
+    # Row 1: Diameter
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        diameter = st.number_input("Sphere Diameter", min_value=0.0, value=1.0, step=0.1, key="sphere_diameter")
+    with col2:
+        diameter_unit = st.selectbox("Diameter Unit", diameter_units, index=0, key="sphere_diameter_unit")
+
+    # Row 2: Density
+    col3, col4 = st.columns([2, 1])
+    with col3:
+        density = st.number_input("Sphere Density", min_value=0.0, value=1000.0, step=10.0, key="sphere_density")
+    with col4:
+        density_unit = st.selectbox("Density Unit", density_units, index=0, key="sphere_density_unit")
+
+    # Row 3: Mass output unit
+    col5, col6 = st.columns([2, 1])
+    with col5:
+        mass_unit = st.selectbox("Mass Output Unit", mass_units, index=0, key="sphere_mass_unit")
+
+    # Calculate mass
+    if st.button("Calculate", key="sphere_calculate"):
+        if diameter <= 0 or density <= 0:
+            st.error("Diameter and density must be positive values.")
+        else:
+            diameter_m = to_si(diameter, diameter_unit, "length")
+            density_kg_m3 = to_si(density, density_unit, "density")
+            mass_kg = cached("sphere_mass", sphere_mass, diameter_m, density_kg_m3)
+            mass_output = from_si(mass_kg, mass_unit, "mass")
+            with col5:
+                st.success(f"The mass of the sphere is {mass_output:.4f} {mass_unit}")
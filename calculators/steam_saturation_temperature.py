@@ -0,0 +1,97 @@
+import numpy as np
+import streamlit as st
+
+from calculators.results import cached
+from data_io import UPLOAD_TYPES, columns_of, read_table
+from engine import steam_saturation_temperature
+from steam import default_table
+from units import from_si, to_si
+
+
+def render(profiler):
+    # LaTeX equation and nomenclature
+    st.markdown("### Equation")
+    st.markdown("The saturation temperature of steam is calculated from the IAPWS-IF97 region 4 backward equation:")
+    st.latex(r"\beta = \left( \frac{P}{1\,\text{MPa}} \right)^{0.25}, \quad "
+             r"E = \beta^2 + n_3 \beta + n_6, \quad F = n_1 \beta^2 + n_4 \beta + n_7, \quad "
+             r"G = n_2 \beta^2 + n_5 \beta + n_8")
+    st.latex(r"D = \frac{2G}{-F - \sqrt{F^2 - 4EG}}, \quad "
+             r"T_{\text{sat}} = \frac{n_{10} + D - \sqrt{(n_{10} + D)^2 - 4(n_9 + n_{10} D)}}{2}")
+
+    st.markdown("### Nomenclature")
+    st.markdown(r"""
+    - $T_{\text{sat}}$: Saturation temperature of steam (K)  
+    - $P$: Pressure, from 611.213 Pa (triple point) to 22.064 MPa (critical point)  
+    - $n_1 \ldots n_{10}$: IF97 region 4 coefficients
+    """)
+
+    # Define unit options (SI first, then smallest to largest)
+    pressure_units = ["bar", "kPa", "MPa", "atm", "psi"]
+    temperature_units = ["°C", "°F", "K"]
+
+    # Mode: one pressure from the input below, or one row per sample from a CSV
+    mode = st.radio("Mode", ["Single pressure", "Batch (CSV)"], horizontal=True, key="steam_mode")
+    batch_mode = mode == "Batch (CSV)"
+
+    # Layout inputs using columns (in batch mode the left column names the CSV column)
+    # Row 1: Pressure
+    col13, col14 = st.columns([2, 1])
+    with col13:
+        if batch_mode:
+            pressure_col = st.text_input("Pressure Column", value="pressure", key="steam_pressure_col")
+        else:
+            pressure = st.number_input("Pressure", min_value=0.0, value=1.0, step=0.1, key="steam_pressure")
+    with col14:
+        pressure_unit = st.selectbox("Pressure Unit", pressure_units, index=0, key="steam_pressure_unit")
+
+    # Row 2: Temperature output unit
+    col15, col16 = st.columns([2, 1])
+    with col15:
+        temperature_unit = st.selectbox("Temperature Output Unit", temperature_units, index=0, key="steam_temperature_unit")
+
+    # Method: the backward equation, or the precomputed table for bulk lookups
+    method_label = st.selectbox("Method", ["IAPWS-IF97 equation", "IF97 lookup table"], index=0,
+                                key="steam_method")
+    method = "if97" if method_label == "IAPWS-IF97 equation" else "table"
+    if method == "table":
+        st.caption(f"Lookup table: max deviation from the IF97 equation ≤ {default_table().max_error:.1e} K")
+
+    # Batch mode: vectorized lookup over every row of the uploaded file
+    if batch_mode:
+        uploaded_file = st.file_uploader("Upload a CSV, Parquet or Feather file with one pressure per row",
+                                         type=UPLOAD_TYPES, key="steam_batch_file")
+        if uploaded_file is not None and st.button("Calculate", key="steam_batch_calculate"):
+            if pressure_col not in columns_of(uploaded_file):
+                st.error(f"Missing column in file: {pressure_col}")
+                return
+            with profiler.timed("steam: parse"):
+                df = read_table(uploaded_file, [pressure_col])
+            with profiler.timed("steam: compute"):
+                t_sat_k = steam_saturation_temperature(
+                    to_si(df[pressure_col].to_numpy(dtype=float), pressure_unit, "pressure"), method=method)
+            output = df.copy()
+            output[f"T_sat ({temperature_unit})"] = from_si(t_sat_k, temperature_unit, "temperature")
+
+            invalid = int(np.isnan(t_sat_k).sum())
+            if invalid:
+                st.warning(f"{invalid} rows are outside 611.213 Pa to 22.064 MPa; their results are empty.")
+            st.write(f"Calculated {len(output)} pressures.")
+            st.dataframe(profiler.payload("steam: table", output.head(1000)))
+            csv = profiler.payload("steam: download", output.to_csv(index=False).encode("utf-8"))
+            st.download_button("Download results CSV", csv, "saturation_results.csv", "text/csv", key="steam_batch_download")
+        return
+
+    # Calculate saturation temperature
+    if st.button("Calculate", key="steam_calculate"):
+        if pressure <= 0:
+            st.error("Pressure must be a positive value.")
+        else:
+            with profiler.timed("steam: compute"):
+                t_sat_k = cached("steam_saturation_temperature", steam_saturation_temperature,
+                                 to_si(pressure, pressure_unit, "pressure"), method=method)
+            if np.isnan(t_sat_k):
+                st.error("Pressure must be between 611.213 Pa and 22.064 MPa (triple point to critical point).")
+            else:
+                t_sat_output = from_si(t_sat_k, temperature_unit, "temperature")
+                with col15:
+                    st.success(f"The saturation temperature is {t_sat_output:.2f} {temperature_unit}")
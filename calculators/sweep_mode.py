@@ -0,0 +1,142 @@
+import numpy as np
+import streamlit as st
+
+from engine import CALCULATIONS
+from sweep import parse_values, run_sweep, sweep_table
+from units import from_si, to_si
+
+# Larger sweeps are strided for display (the table and download have every
+# point): cells per heatmap axis, and lines in a line family
+MAX_HEATMAP_CELLS = 500
+MAX_SERIES = 20
+# Rows of the sweep table shown on the page
+TABLE_ROWS = 1000
+
+
+# Log axis for positive values spanning two decades or more
+def _axis_type(values):
+    return "log" if values.min() > 0 and values.max() >= 100 * values.min() else "linear"
+
+
+# Sweep mode of a calculator: values for every input of an engine calculation,
+# evaluated over their Cartesian grid in one vectorized pass (see sweep.py).
+#   units:     input/output name -> unit options (SI first)
+#   defaults:  input name -> initial values text
+#   labels:    input/output name -> display label
+# The last sweep is kept in session state under `key` in SI units, so changing
+# the plot does not recompute it; the table and CSV are rebuilt in the current
+# display units when these change.
+def render_sweep(calculation, units, defaults, labels, profiler, key):
+    spec = CALCULATIONS[calculation]
+    st.caption("Enter a list of values (1, 2, 5) or a range start:stop:count, optionally log-spaced "
+               "(0.001:0.1:50 log). Every combination of the inputs is evaluated.")
+
+    unit_of = {}
+    texts = {}
+    for name in spec["inputs"]:
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            texts[name] = st.text_input(f"{labels[name]} Values", value=defaults[name], key=f"{key}_{name}_values")
+        with col2:
+            unit_of[name] = st.selectbox(f"{labels[name]} Unit", units[name], index=0, key=f"{key}_{name}_unit")
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        output = st.selectbox("Output", list(spec["outputs"]), format_func=labels.get, key=f"{key}_output")
+    with col2:
+        if spec["outputs"][output]:
+            unit_of[output] = st.selectbox("Output Unit", units[output], index=0, key=f"{key}_output_unit")
+
+    if st.button("Run sweep", key=f"{key}_run"):
+        try:
+            values = {name: to_si(parse_values(texts[name]), unit_of[name], dimension)
+                      for name, dimension in spec["inputs"].items()}
+            with profiler.timed(f"{key}: compute"):
+                results = run_sweep(calculation, values)
+        except ValueError as e:
+            st.error(f"Invalid sweep: {str(e)}")
+            return
+        st.session_state[key] = {"values": values, "results": results, "units": None}
+
+    sweep = st.session_state.get(key)
+    if sweep is None:
+        return
+    values, results = sweep["values"], sweep["results"]
+    if sweep["units"] != unit_of:
+        with profiler.timed(f"{key}: table"):
+            table = sweep_table(calculation, values, results, unit_of)
+            csv = table.to_csv(index=False).encode("utf-8")
+        sweep.update(units=dict(unit_of), head=table.head(TABLE_ROWS), rows=len(table), csv=csv)
+
+    # Inputs and the selected output in the current display units
+    def shown(name, si_values):
+        dimension = spec["inputs"].get(name) or spec["outputs"].get(name)
+        return from_si(si_values, unit_of[name], dimension) if dimension else si_values
+
+    def title(name):
+        return f"{labels[name]} ({unit_of[name]})" if name in unit_of else labels[name]
+
+    names = list(spec["inputs"])
+    varied = [name for name in names if len(values[name]) > 1]
+    z = shown(output, results[output])
+
+    if not varied:
+        st.success(f"{title(output)}: {z.ravel()[0]:.4g}")
+    else:
+        import plotly.graph_objects as go
+
+        from plotting import line_trace
+
+        if len(varied) == 1:
+            kind, x_name, y_name = "Line", varied[0], None
+        else:
+            kind = st.radio("Plot", ["Heatmap", "Line family"], horizontal=True, key=f"{key}_plot")
+            col1, col2 = st.columns(2)
+            with col1:
+                x_name = st.selectbox("X Axis", varied, format_func=labels.get, key=f"{key}_x")
+            with col2:
+                y_name = st.selectbox("Y Axis" if kind == "Heatmap" else "Series",
+                                      [name for name in varied if name != x_name],
+                                      format_func=labels.get, key=f"{key}_y")
+
+        # Inputs not on the plot are held at a chosen value
+        index = []
+        for name in names:
+            if name in (x_name, y_name):
+                index.append(slice(None))
+            elif name in varied:
+                options = shown(name, values[name])
+                index.append(st.select_slider(title(name), options=list(range(len(options))),
+                                              format_func=lambda i, options=options: f"{options[i]:.4g}",
+                                              key=f"{key}_{name}_at"))
+            else:
+                index.append(0)
+        section = z[tuple(index)]
+
+        with profiler.timed(f"{key}: plot build"):
+            x = shown(x_name, values[x_name])
+            fig = go.Figure()
+            if kind == "Line":
+                fig.add_trace(line_trace(x, section, labels[output]))
+            else:
+                if names.index(x_name) < names.index(y_name):
+                    section = section.T  # rows along y, columns along x
+                y = shown(y_name, values[y_name])
+                if kind == "Heatmap":
+                    sx = -(-len(x) // MAX_HEATMAP_CELLS)
+                    sy = -(-len(y) // MAX_HEATMAP_CELLS)
+                    fig.add_trace(go.Heatmap(x=x[::sx], y=y[::sy], z=section[::sy, ::sx],
+                                             colorbar=dict(title=title(output))))
+                    fig.update_layout(yaxis_title=title(y_name), yaxis_type=_axis_type(y))
+                else:
+                    for j in np.unique(np.linspace(0, len(y) - 1, MAX_SERIES).astype(int)):
+                        fig.add_trace(line_trace(x, section[j], f"{labels[y_name]} = {y[j]:.4g} {unit_of[y_name]}"))
+            if kind != "Heatmap":
+                fig.update_layout(yaxis_title=title(output))
+            fig.update_layout(xaxis_title=title(x_name), xaxis_type=_axis_type(x))
+        st.plotly_chart(profiler.payload(f"{key}: figure", fig))
+
+    st.write(f"Calculated {sweep['rows']} points.")
+    st.dataframe(profiler.payload(f"{key}: table", sweep["head"]))
+    csv = profiler.payload(f"{key}: download", sweep["csv"])
+    st.download_button("Download results CSV", csv, f"{calculation}_sweep.csv", "text/csv", key=f"{key}_download")
@@ -0,0 +1,166 @@
+import os
+
+import numpy as np
+
+# pandas is imported by the functions below, not here, so that the apps can
+# import UPLOAD_TYPES at cold start
+# Rows parsed per chunk when streaming a column
+CHUNKSIZE = 1_000_000
+
+# Upload types accepted by the apps: CSV, and the columnar formats read through
+# pyarrow with column projection (Feather v2 is the Arrow IPC file format; the
+# legacy Feather v1 format has no record batches and is read whole)
+COLUMNAR_TYPES = ["parquet", "feather", "arrow"]
+UPLOAD_TYPES = ["csv", *COLUMNAR_TYPES]
+
+# Leading magic bytes of the columnar formats
+_MAGIC = {b"PAR1": "parquet", b"ARROW1": "arrow", b"FEA1": "feather1"}
+
+
+# Format of a file object or path from its leading bytes: "parquet", "arrow",
+# "feather1" (Feather v1), or "csv" for anything else
+def file_format(file):
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            head = f.read(6)
+    else:
+        file.seek(0)
+        head = file.read(6)
+        file.seek(0)
+    for magic, fmt in _MAGIC.items():
+        if head.startswith(magic):
+            return fmt
+    return "csv"
+
+
+# pyarrow input for a columnar file: paths are memory-mapped, and uploads (which
+# Streamlit holds in memory) are wrapped without a copy
+def _arrow_source(file):
+    import pyarrow as pa
+
+    if isinstance(file, (str, os.PathLike)):
+        return pa.memory_map(os.fspath(file))
+    if hasattr(file, "getbuffer"):
+        return pa.BufferReader(pa.py_buffer(file.getbuffer()))
+    file.seek(0)
+    return file
+
+
+def _arrow_schema(file, fmt):
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+    from pyarrow import feather
+
+    if fmt == "parquet":
+        return pq.read_schema(_arrow_source(file))
+    if fmt == "feather1":
+        # Feather v1 has no schema-only reader; its uncompressed columns are
+        # mapped from the source without decoding
+        return feather.read_table(_arrow_source(file)).schema
+    return pyarrow.ipc.open_file(_arrow_source(file)).schema
+
+
+# Column names (positions resolved to names) of the requested columns; all by default
+def _column_names(columns, names):
+    if columns is None:
+        return list(names)
+    return [names[c] if isinstance(c, (int, np.integer)) else c for c in columns]
+
+
+# Column names of a CSV, read from the header only
+def csv_columns(file):
+    import pandas as pd
+
+    file.seek(0)
+    columns = list(pd.read_csv(file, nrows=0).columns)
+    file.seek(0)
+    return columns
+
+
+# Column names of a CSV, Parquet or Feather/Arrow file (from the header or the
+# schema only)
+def columns_of(file):
+    import pandas as pd
+
+    fmt = file_format(file)
+    if fmt == "csv":
+        return csv_columns(file) if hasattr(file, "seek") else list(pd.read_csv(file, nrows=0).columns)
+    return list(_arrow_schema(file, fmt).names)
+
+
+# Read some columns (names or positions, in that order; all by default) of a
+# CSV, Parquet or Feather/Arrow file into a DataFrame. Columnar files decode
+# only those columns.
+def read_table(file, columns=None):
+    import pandas as pd
+
+    fmt = file_format(file)
+    names = _column_names(columns, columns_of(file))
+    if fmt == "csv":
+        if hasattr(file, "seek"):
+            file.seek(0)
+        return pd.read_csv(file, usecols=names)[names]
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(_arrow_source(file), columns=names)
+    else:
+        from pyarrow import feather
+
+        table = feather.read_table(_arrow_source(file), columns=names)
+    return table.to_pandas()
+
+
+# Stream some columns of a CSV, Parquet or Feather/Arrow file as DataFrames of
+# at most about `chunksize` rows: CSV chunks, Parquet record batches, the
+# record batches of the Arrow file (which the writer sized), or slices of a
+# Feather v1 file read whole
+def iter_frames(file, columns=None, chunksize=CHUNKSIZE):
+    import pandas as pd
+
+    fmt = file_format(file)
+    all_names = columns_of(file)
+    names = _column_names(columns, all_names)
+    if fmt == "csv":
+        if hasattr(file, "seek"):
+            file.seek(0)
+        for chunk in pd.read_csv(file, usecols=names, chunksize=chunksize):
+            yield chunk[names]
+        return
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+    from pyarrow import feather
+
+    if fmt == "parquet":
+        for batch in pq.ParquetFile(_arrow_source(file)).iter_batches(batch_size=chunksize, columns=names):
+            yield batch.to_pandas()
+    elif fmt == "feather1":
+        for batch in feather.read_table(_arrow_source(file), columns=names).to_batches(max_chunksize=chunksize):
+            yield batch.to_pandas()
+    else:
+        options = pyarrow.ipc.IpcReadOptions(included_fields=[all_names.index(name) for name in names])
+        reader = pyarrow.ipc.open_file(_arrow_source(file), options=options)
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i).to_pandas()[names]
+
+
+# Stream one column (by name or position) as float arrays, one chunk at a time,
+# with non-numeric and missing values dropped. Only that column is parsed, so
+# memory is bounded by the chunk size rather than the file size.
+def iter_column(file, column, chunksize=CHUNKSIZE):
+    import pandas as pd
+
+    for chunk in iter_frames(file, [column], chunksize):
+        values = pd.to_numeric(chunk.iloc[:, 0], errors="coerce").to_numpy(dtype=float)
+        yield values[~np.isnan(values)]
+
+
+# Stream several columns as a tuple of float arrays per chunk, keeping only the
+# rows where every column is numeric
+def iter_columns(file, columns, chunksize=CHUNKSIZE):
+    import pandas as pd
+
+    for chunk in iter_frames(file, columns, chunksize):
+        values = chunk.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        values = values[~np.isnan(values).any(axis=1)]
+        yield tuple(values.T)
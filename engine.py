@@ -0,0 +1,96 @@
+import numpy as np
+
+from steam import default_table, saturation_temperature
+from units import from_si, to_si
+
+# Headless calculation engine. Every function takes SI inputs and returns SI
+# outputs, and accepts scalars or NumPy arrays so the same code serves the
+# Streamlit pages, the CSV batch runner and nightly jobs. The settling solvers
+# (SciPy, pandas) are imported on first use, so the other calculations stay
+# cheap to import.
+
+
+# Sphere mass (kg) from diameter (m) and density (kg/m³)
+def sphere_mass(diameter, density):
+    radius = diameter / 2
+    volume = (4/3) * np.pi * radius ** 3
+    return density * volume
+
+
+# Cylinder volume (m³) from diameter (m) and height (m)
+def cylinder_volume(diameter, height):
+    radius = diameter / 2
+    return np.pi * radius ** 2 * height
+
+
+# Steam saturation temperature (K) from pressure (Pa); NaN outside the
+# saturation line (611.213 Pa to 22.064 MPa) for the IF97 methods.
+#   "if97":          IAPWS-IF97 region 4 backward equation
+#   "table":         precomputed IF97 lookup table (see steam.SaturationTable)
+#   "approximation": legacy T_sat = 100 * (P / 0.6113)^0.25, P in bar, T_sat in °C
+def steam_saturation_temperature(pressure, method="if97"):
+    if method == "if97":
+        return saturation_temperature(pressure)
+    elif method == "table":
+        return default_table()(pressure)
+    elif method == "approximation":
+        pressure_bar = from_si(pressure, "bar", "pressure")
+        t_sat_c = 100 * (pressure_bar / 0.6113) ** 0.25
+        return to_si(t_sat_c, "°C", "temperature")
+    raise ValueError(f"Unknown saturation temperature method: {method}")
+
+
+# Terminal settling of one particle; returns Re_p, C_D, v_t (m/s), t (s), z (m)
+def particle_settling(diameter, particle_density, fluid_density, fluid_viscosity, solver="adaptive"):
+    from settling import settling_adaptive, settling_euler
+
+    if solver == "adaptive":
+        return settling_adaptive(diameter, particle_density, fluid_density, fluid_viscosity)
+    elif solver == "euler":
+        return settling_euler(diameter, particle_density, fluid_density, fluid_viscosity)
+    raise ValueError(f"Unknown settling solver: {solver}")
+
+
+# Terminal settling of arrays of particles; returns a DataFrame of Re_p, C_D, v_t, t, z.
+# progress(fraction) is called as the particles are solved.
+def particle_settling_batch(diameter, particle_density, fluid_density, fluid_viscosity, progress=None):
+    from settling import settling_batch
+
+    return settling_batch(diameter, particle_density, fluid_density, fluid_viscosity, progress=progress)
+
+
+# Vectorized entry points for the batch runner: input and output columns with
+# their unit dimensions, and a function mapping SI input arrays to SI outputs
+CALCULATIONS = {
+    "sphere_mass": {
+        "inputs": {"diameter": "length", "density": "density"},
+        "outputs": {"mass": "mass"},
+        "compute": lambda diameter, density: {"mass": sphere_mass(diameter, density)},
+    },
+    "cylinder_volume": {
+        "inputs": {"diameter": "length", "height": "length"},
+        "outputs": {"volume": "volume"},
+        "compute": lambda diameter, height: {"volume": cylinder_volume(diameter, height)},
+    },
+    "steam_saturation_temperature": {
+        "inputs": {"pressure": "pressure"},
+        "outputs": {"t_sat": "temperature"},
+        "compute": lambda pressure: {"t_sat": steam_saturation_temperature(pressure)},
+    },
+    "steam_saturation_temperature_table": {
+        "inputs": {"pressure": "pressure"},
+        "outputs": {"t_sat": "temperature"},
+        "compute": lambda pressure: {"t_sat": steam_saturation_temperature(pressure, method="table")},
+    },
+    "particle_settling": {
+        "inputs": {
+            "diameter": "length",
+            "particle_density": "density",
+            "fluid_density": "density",
+            "fluid_viscosity": "viscosity",
+        },
+        "outputs": {"Re_p": None, "C_D": None, "v_t": "velocity", "t": "time", "z": "length"},
+        "compute": lambda **inputs: {name: values.to_numpy() for name, values in
+                                     particle_settling_batch(**inputs).items()},
+    },
+}
@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import streamlit as st
+
+from cache import estimate_size
+
+# Profiling is opt-in: set EC_PROFILE=1 in the environment (all sessions) or open
+# an app with ?profile=1 (that session). Set EC_PROFILE_LOG to a file path to
+# append every rerun's records to it as JSON lines.
+PROFILE_ENV = "EC_PROFILE"
+LOG_ENV = "EC_PROFILE_LOG"
+# Records kept per session for the debug panel's percentiles
+HISTORY_SIZE = 2000
+
+_log_lock = threading.Lock()
+
+
+# Bytes sent to the browser for a displayed object: the JSON of a Plotly figure,
+# the length of bytes/str (downloads), else the in-memory estimate
+def payload_size(obj):
+    if hasattr(obj, "to_plotly_json"):
+        return len(obj.to_json())
+    if isinstance(obj, (bytes, str)):
+        return len(obj)
+    return estimate_size(obj)
+
+
+# Records the timings and payload sizes of one script rerun. Every method is a
+# no-op when disabled, so the hooks can stay in the apps.
+#   timed(name):       context manager timing a block (kind "compute" by default)
+#   wrap(func, name):  func wrapped in timed(name, kind="render")
+#   payload(name, x):  record the size of x and return x unchanged
+#   finish():          record the total rerun latency and append to the log
+class Profiler:
+    def __init__(self, app, enabled=False, session_id=None, log_path=None):
+        self.app = app
+        self.enabled = enabled
+        self.session_id = session_id
+        self.log_path = log_path
+        self.records = []
+        self.finished = False
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def timed(self, name, kind="compute"):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, kind, seconds=time.perf_counter() - start)
+
+    def wrap(self, func, name, kind="render"):
+        def timed_func(*args, **kwargs):
+            with self.timed(name, kind):
+                return func(*args, **kwargs)
+        return timed_func
+
+    def payload(self, name, obj):
+        if self.enabled:
+            self._add(name, "payload", nbytes=payload_size(obj))
+        return obj
+
+    def _add(self, name, kind, seconds=None, nbytes=None):
+        self.records.append({"time": time.time(), "app": self.app, "session": self.session_id,
+                             "name": name, "kind": kind, "seconds": seconds, "bytes": nbytes})
+
+    def finish(self):
+        if self.enabled and not self.finished:
+            self._add("rerun", "rerun", seconds=time.perf_counter() - self._start)
+            if self.log_path:
+                append_log(self.log_path, self.records)
+        self.finished = True
+        return self.records
+
+
+def append_log(path, records):
+    lines = "".join(json.dumps(record) + "\n" for record in records)
+    with _log_lock, open(path, "a") as f:
+        f.write(lines)
+
+
+# pandas is imported by the functions below only, since the profiler itself is
+# created on every rerun of every app, profiled or not
+def read_log(path):
+    import pandas as pd
+
+    return pd.read_json(path, lines=True)
+
+
+# p50/p95 of time and payload size per (app, name, kind) over a set of records
+def summarize(records):
+    import pandas as pd
+
+    df = pd.DataFrame(records)
+    if df.empty:
+        return pd.DataFrame(columns=["app", "name", "kind", "count", "p50 (ms)", "p95 (ms)",
+                                     "p50 (KiB)", "p95 (KiB)"])
+    df[["seconds", "bytes"]] = df[["seconds", "bytes"]].astype(float)
+    groups = df.groupby(["app", "name", "kind"], sort=False)
+    summary = groups.size().rename("count").to_frame()
+    summary["p50 (ms)"] = groups["seconds"].quantile(0.5) * 1e3
+    summary["p95 (ms)"] = groups["seconds"].quantile(0.95) * 1e3
+    summary["p50 (KiB)"] = groups["bytes"].quantile(0.5) / 1024
+    summary["p95 (KiB)"] = groups["bytes"].quantile(0.95) / 1024
+    return summary.reset_index()
+
+
+# Profiler for the current Streamlit session, enabled by EC_PROFILE or ?profile=1
+def session_profiler(app):
+    enabled = os.environ.get(PROFILE_ENV, "") not in ("", "0") or st.query_params.get("profile") == "1"
+    session_id = st.session_state.setdefault("_profile_session", uuid.uuid4().hex[:8])
+    return Profiler(app, enabled=enabled, session_id=session_id,
+                    log_path=os.environ.get(LOG_ENV))
+
+
+# Finish the rerun and show its records, plus the session's percentiles and the
+# stats of the given {name: LRUCache} caches, in a sidebar expander. Call last in
+# the script (and before any st.stop()).
+def debug_panel(profiler, caches=None):
+    records = profiler.finish()
+    if not profiler.enabled:
+        return
+    import pandas as pd
+
+    history = st.session_state.setdefault("_profile_history", [])
+    history.extend(records)
+    del history[:-HISTORY_SIZE]
+
+    with st.sidebar.expander("Profiling", expanded=False):
+        this_run = pd.DataFrame(records)[["name", "kind", "seconds", "bytes"]].astype({"seconds": float, "bytes": float})
+        this_run["ms"] = this_run["seconds"] * 1e3
+        this_run["KiB"] = this_run["bytes"] / 1024
+        st.caption("This rerun")
+        st.dataframe(this_run[["name", "kind", "ms", "KiB"]], hide_index=True)
+        st.caption("This session")
+        st.dataframe(summarize(history).drop(columns=["app"]), hide_index=True)
+        if caches:
+            st.caption("Caches (server-wide)")
+            st.dataframe(pd.DataFrame([{"cache": name, **cache.stats()} for name, cache in caches.items()]),
+                         hide_index=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a profiling log (JSON lines) as p50/p95 per block.")
+    parser.add_argument("log", help="JSON-lines log written with EC_PROFILE_LOG")
+    parser.add_argument("--app", help="only records of this app")
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+
+    df = read_log(args.log)
+    if args.app:
+        df = df[df["app"] == args.app]
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(summarize(df).to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import streamlit as st
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Worker threads shared by every session of the server: one per CPU (at least
+# two), overridable from the environment
+JOB_WORKERS = int(os.environ.get("EC_JOB_WORKERS", max(2, os.cpu_count() or 1)))
+# Seconds a script run waits on a job it has just started, so that quick jobs
+# (small data, cache hits) render in the same run without a progress bar
+QUICK_WAIT = 0.25
+# Seconds between refreshes of a running job's progress bar
+POLL_INTERVAL = 0.5
+
+
+# Raised inside a job's computation at its next progress report once the job is
+# cancelled. Like asyncio.CancelledError it is not an Exception, so code that
+# turns errors into results (e.g. one failed model in fit-all mode) lets it through.
+class JobCancelled(BaseException):
+    pass
+
+
+# A computation running on the worker pool. It is called with progress=report
+# and reports the fraction done (0 to 1) as it goes; cancelling sets a flag that
+# makes the next report raise JobCancelled, so the computation stops there (a
+# job still queued never starts). A job whose session has ended cancels itself
+# at its next report.
+class Job:
+    def __init__(self, slot, key, session_id=None):
+        self.slot = slot
+        self.key = key
+        self.session_id = session_id
+        self.progress = 0.0
+        self.future = None
+        self._cancelled = threading.Event()
+
+    def report(self, fraction):
+        if self.session_id is not None and runtime.exists() and \
+                not runtime.get_instance().is_active_session(self.session_id):
+            self._cancelled.set()
+        if self._cancelled.is_set():
+            raise JobCancelled()
+        self.progress = min(max(float(fraction), 0.0), 1.0)
+
+    def cancel(self):
+        self._cancelled.set()
+        self.future.cancel()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def done(self):
+        return self.future.done()
+
+    def result(self):
+        return self.future.result()
+
+
+@st.cache_resource
+def job_pool():
+    return ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+
+
+def _session_jobs():
+    return st.session_state.setdefault("_jobs", {})
+
+
+# The job in this session's `slot` if it was started for `key`. A job there for
+# other inputs is cancelled and dropped, so a stale computation stops using the
+# workers as soon as the inputs change.
+def current_job(slot, key):
+    jobs = _session_jobs()
+    job = jobs.get(slot)
+    if job is not None and job.key != key:
+        job.cancel()
+        del jobs[slot]
+        return None
+    return job
+
+
+# Cancel and drop the job in this session's `slot`, if any (e.g. when the
+# feature that started it is switched off)
+def cancel_job(slot):
+    job = _session_jobs().pop(slot, None)
+    if job is not None:
+        job.cancel()
+
+
+# Run func(*args, progress=..., **kwargs) in the background for the inputs
+# `key`, as the job of this session's `slot`; the job already there for the same
+# key is returned instead unless `restart` is set. The function must not call
+# Streamlit: it runs outside the script.
+def submit_job(slot, key, func, *args, restart=False, **kwargs):
+    job = current_job(slot, key)
+    if job is not None and not restart:
+        return job
+    if job is not None:
+        job.cancel()
+    ctx = get_script_run_ctx()
+    job = Job(slot, key, ctx.session_id if ctx is not None else None)
+    job.future = job_pool().submit(func, *args, progress=job.report, **kwargs)
+    _session_jobs()[slot] = job
+    wait([job.future], timeout=QUICK_WAIT)
+    return job
+
+
+# Polls the job without rerunning the rest of the page, then reruns the page
+# once it has finished
+@st.fragment(run_every=POLL_INTERVAL)
+def _job_progress(job, label):
+    if job.done():
+        st.rerun()
+    st.progress(job.progress, text=f"{label}... {job.progress:.0%}")
+    if st.button("Cancel", key=f"_job_cancel_{job.slot}"):
+        job.cancel()
+        st.rerun()
+
+
+# Result of a job, or None while it runs (with a progress bar and a Cancel
+# button in its place) or after it was cancelled (with a button to run it
+# again). A failed job re-raises its exception here.
+def job_result(job, label):
+    if job.cancelled:
+        st.info(f"{label} cancelled.")
+        if st.button("Run again", key=f"_job_restart_{job.slot}"):
+            _session_jobs().pop(job.slot, None)
+            st.rerun()
+        return None
+    if not job.done():
+        _job_progress(job, label)
+        return None
+    return job.result()
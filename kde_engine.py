@@ -0,0 +1,579 @@
+import numpy as np
+from scipy.special import ndtr
+
+# Kernel functions
+def gaussian_kernel(u):
+    return (1 / np.sqrt(2 * np.pi)) * np.exp(-0.5 * u**2)
+
+def epanechnikov_kernel(u):
+    return np.where(np.abs(u) <= 1, 0.75 * (1 - u**2), 0)
+
+def uniform_kernel(u):
+    return np.where(np.abs(u) <= 1, 0.5, 0)
+
+def triangular_kernel(u):
+    return np.where(np.abs(u) <= 1, 1 - np.abs(u), 0)
+
+kernel_options = {
+    "Gaussian": gaussian_kernel,
+    "Epanechnikov": epanechnikov_kernel,
+    "Uniform": uniform_kernel,
+    "Triangular": triangular_kernel
+}
+
+# Kernel CDFs (closed form)
+def gaussian_cdf(u):
+    return ndtr(u)
+
+def epanechnikov_cdf(u):
+    u = np.clip(u, -1, 1)
+    return 0.5 + 0.75 * u - 0.25 * u**3
+
+def uniform_cdf(u):
+    return np.clip(0.5 * (u + 1), 0, 1)
+
+def triangular_cdf(u):
+    u = np.clip(u, -1, 1)
+    return np.where(u <= 0, 0.5 * (1 + u)**2, 1 - 0.5 * (1 - u)**2)
+
+kernel_cdfs = {
+    "Gaussian": gaussian_cdf,
+    "Epanechnikov": epanechnikov_cdf,
+    "Uniform": uniform_cdf,
+    "Triangular": triangular_cdf
+}
+
+# Support of each kernel in units of h. The Gaussian is truncated at 8h, where
+# the kernel has dropped below 1e-14 of its peak.
+kernel_support = {
+    "Gaussian": 8.0,
+    "Epanechnikov": 1.0,
+    "Uniform": 1.0,
+    "Triangular": 1.0
+}
+
+# Integer weights throughout this module are frequencies: a value with weight w
+# counts as w samples. Pre-aggregated (value, count) data therefore give exactly
+# the estimates of the raw samples they summarize, at the cost of the distinct
+# values. Non-integer weights are relative (reliability) weights: only their
+# ratios matter, and the sample size is Kish's effective n = (Σw)² / Σw².
+
+
+# Raise ValueError unless the weights are non-negative (and, with total=True,
+# have a positive total)
+def check_weights(weights, total=True):
+    weights = np.asarray(weights, dtype=float)
+    if np.any(weights < 0) or (total and np.sum(weights) <= 0):
+        raise ValueError("Weights must be non-negative, with a positive total.")
+
+
+# Weights as frequencies: integer counts unchanged, non-integer weights rescaled
+# to sum to their effective sample size. The frequency formulas (n = Σw, ddof 1)
+# on the rescaled weights are then the reliability-weight estimates, whose
+# variance divides by Σw (1 - Σw² / (Σw)²), and do not change with the scale
+# of the weights.
+def effective_weights(weights):
+    if weights is None:
+        return None
+    weights = np.asarray(weights, dtype=float)
+    if np.all(weights == np.round(weights)):
+        return weights
+    return weights * (weights.sum() / np.dot(weights, weights))
+
+# Distinct values of the data with their total weight (their count when
+# unweighted), sorted by value
+def aggregate_values(data, weights=None):
+    data = np.asarray(data, dtype=float)
+    if weights is None:
+        values, counts = np.unique(data, return_counts=True)
+        return values, counts.astype(float)
+    values, inverse = np.unique(data, return_inverse=True)
+    return values, np.bincount(inverse, weights=np.asarray(weights, dtype=float), minlength=len(values))
+
+
+# Sample size and standard deviation (ddof=1) of weighted data: the total of
+# frequency weights, or the effective sample size of reliability weights
+def weighted_moments(data, weights=None):
+    data = np.asarray(data, dtype=float)
+    if weights is None:
+        return len(data), (np.std(data, ddof=1) if len(data) > 1 else 0.0)
+    check_weights(weights)
+    weights = effective_weights(weights)
+    n = weights.sum()
+    if n <= 1:
+        return n, 0.0
+    mean = np.dot(weights, data) / n
+    return n, np.sqrt(np.dot(weights, (data - mean)**2) / (n - 1))
+
+
+# Bandwidth computation. Rules of thumb use the moments only; the data-driven
+# selectors ("sheather-jones", "lscv") run on the data binned onto a grid.
+def compute_bandwidth(data, method, kernel_name="Gaussian", weights=None):
+    weights = effective_weights(weights)
+    n, std = weighted_moments(data, weights)
+    if n <= 1:
+        return 1.0  # Default if insufficient data
+    if method in data_driven_selectors:
+        data = np.asarray(data, dtype=float)
+        lo, hi = np.min(data), np.max(data)
+        if hi == lo:
+            return 0.0
+        counts = linear_binning(data, lo, hi, SELECTOR_GRID_POINTS, weights)
+        return bandwidth_from_counts(counts, lo, hi, method, kernel_name)
+    return bandwidth_from_moments(n, std, method)
+
+# Rule-of-thumb bandwidth from the sample size and standard deviation alone
+def bandwidth_from_moments(n, std, method):
+    if n <= 1:
+        return 1.0  # Default if insufficient data
+    if method == "scott":
+        return 1.059 * std * n**(-0.2)
+    elif method == "silverman":
+        return 0.9 * std * n**(-0.2)
+    else:
+        raise ValueError("Unknown bandwidth method")
+
+# --- Data-driven bandwidth selectors on binned data ---------------------------
+# Both selectors need sums over all pairs of points, O(n²) directly. On counts
+# c_k at grid nodes k·delta, any pair sum of g(X_i - X_j) becomes
+# sum_d A(d) g(d·delta) with A the autocorrelation of the counts, computed once
+# by FFT; every candidate bandwidth then costs O(m) for m grid nodes.
+# Both are derived for the Gaussian kernel and converted to the other kernels
+# through their canonical bandwidths (Marron & Nolan): h_K = h_G · delta_K / delta_G.
+
+# Grid nodes used when raw data are binned for a selector
+SELECTOR_GRID_POINTS = 4096
+
+# Canonical bandwidth (R(K) / mu2(K)²)^(1/5) of each kernel
+canonical_bandwidth = {
+    "Gaussian": (1 / (2 * np.sqrt(np.pi))) ** 0.2,
+    "Epanechnikov": 15 ** 0.2,
+    "Uniform": 4.5 ** 0.2,
+    "Triangular": 24 ** 0.2
+}
+
+
+# Pair counts of the binned data at lags d = 0..m-1 (symmetric in d)
+def _lag_counts(counts):
+    m = len(counts)
+    size = 1 << int(np.ceil(np.log2(2 * m)))
+    spectrum = np.fft.rfft(counts, size)
+    return np.maximum(np.fft.irfft(spectrum * np.conj(spectrum), size)[:m], 0)
+
+
+# sum over all ordered pairs of g(lag), from the one-sided lag counts
+def _pair_sum(lag_counts, g_values):
+    return lag_counts[0] * g_values[..., 0] + 2 * np.sum(lag_counts[1:] * g_values[..., 1:], axis=-1)
+
+
+# Sample scale min(std, IQR / 1.349) of binned data
+def _binned_scale(counts, grid):
+    n = counts.sum()
+    mean = np.sum(counts * grid) / n
+    std = np.sqrt(np.sum(counts * (grid - mean)**2) / (n - 1))
+    cum = np.cumsum(counts)
+    q1, q3 = np.interp([0.25 * n, 0.75 * n], cum, grid)
+    iqr_scale = (q3 - q1) / 1.349
+    return min(std, iqr_scale) if iqr_scale > 0 else std
+
+
+# Gaussian density functional psi_r = E[f^(r)(X)] estimated with pilot bandwidth
+# g (Sheather & Jones), for r = 4 or 6
+def _psi(lag_counts, offsets, n, r, g):
+    u = offsets / g
+    phi = np.exp(-0.5 * u**2) / np.sqrt(2 * np.pi)
+    if r == 4:
+        derivative = (u**4 - 6 * u**2 + 3) * phi
+    else:
+        derivative = (u**6 - 15 * u**4 + 45 * u**2 - 15) * phi
+    return _pair_sum(lag_counts, derivative) / (n**2 * g**(r + 1))
+
+
+# Sheather-Jones direct plug-in bandwidth (two-stage, Wand & Jones 1995):
+# psi_8 from a normal reference, then psi_6 and psi_4 estimated with their
+# AMSE-optimal pilot bandwidths, then the AMISE-optimal h
+def sheather_jones_bandwidth(counts, lo, hi):
+    counts = np.asarray(counts, dtype=float)
+    m, n = len(counts), counts.sum()
+    grid = np.linspace(lo, hi, m)
+    offsets = np.arange(m) * (hi - lo) / (m - 1)
+    lag_counts = _lag_counts(counts)
+
+    scale = _binned_scale(counts, grid)
+    psi8 = 105 / (32 * np.sqrt(np.pi) * scale**9)
+    g1 = (30 / (np.sqrt(2 * np.pi) * psi8 * n)) ** (1 / 9)
+    psi6 = _psi(lag_counts, offsets, n, 6, g1)
+    g2 = (-6 / (np.sqrt(2 * np.pi) * psi6 * n)) ** (1 / 7)
+    psi4 = _psi(lag_counts, offsets, n, 4, g2)
+    return (1 / (2 * np.sqrt(np.pi) * psi4 * n)) ** 0.2
+
+
+# Least-squares cross-validation score of Gaussian bandwidths h (array):
+# integral of f_h² minus twice the mean leave-one-out density at the data
+def lscv_scores(counts, lo, hi, h):
+    counts = np.asarray(counts, dtype=float)
+    m, n = len(counts), counts.sum()
+    offsets = np.arange(m) * (hi - lo) / (m - 1)
+    lag_counts = _lag_counts(counts)
+    h = np.atleast_1d(np.asarray(h, dtype=float))[:, None]
+    u = offsets / h
+    conv_self = np.exp(-0.25 * u**2) / np.sqrt(4 * np.pi)  # (K * K)(u), the N(0, 2) density
+    kernel = np.exp(-0.5 * u**2) / np.sqrt(2 * np.pi)
+    integral_sq = _pair_sum(lag_counts, conv_self) / (n**2 * h[:, 0])
+    leave_one_out = (_pair_sum(lag_counts, kernel) - n / np.sqrt(2 * np.pi)) / (n * (n - 1) * h[:, 0])
+    return integral_sq - 2 * leave_one_out
+
+
+# LSCV bandwidth: the minimizer of lscv_scores over a log-spaced search between
+# a few grid spacings (binning is not accurate below that) and the oversmoothed
+# bandwidth, refined on a finer log grid around the best candidate
+def lscv_bandwidth(counts, lo, hi, n_candidates=64):
+    counts = np.asarray(counts, dtype=float)
+    m, n = len(counts), counts.sum()
+    delta = (hi - lo) / (m - 1)
+    h_max = 1.144 * _binned_scale(counts, np.linspace(lo, hi, m)) * n**(-0.2)
+    h_min = min(3 * delta, 0.5 * h_max)
+    candidates = np.geomspace(h_min, h_max, n_candidates)
+    best = int(np.argmin(lscv_scores(counts, lo, hi, candidates)))
+    fine = np.geomspace(candidates[max(best - 1, 0)], candidates[min(best + 1, n_candidates - 1)], n_candidates)
+    return float(fine[np.argmin(lscv_scores(counts, lo, hi, fine))])
+
+
+data_driven_selectors = {
+    "sheather-jones": sheather_jones_bandwidth,
+    "lscv": lscv_bandwidth
+}
+
+
+# Data-driven bandwidth for kernel_name from counts on linspace(lo, hi, m).
+# Counts binned from reliability weights are rescaled to n_eff, their effective
+# sample size, when it is given.
+def bandwidth_from_counts(counts, lo, hi, method, kernel_name="Gaussian", n_eff=None):
+    if method not in data_driven_selectors:
+        raise ValueError("Unknown bandwidth method")
+    if n_eff is not None:
+        counts = np.asarray(counts, dtype=float) * (n_eff / np.sum(counts))
+    h_gaussian = data_driven_selectors[method](counts, lo, hi)
+    return h_gaussian * canonical_bandwidth[kernel_name] / canonical_bandwidth["Gaussian"]
+
+
+# KDE function (exact sum over every data point, or every weighted value);
+# progress(fraction) is called after each point of x
+def kde_func(x, data, h, kernel, weights=None, progress=None):
+    x = np.atleast_1d(x)
+    res = np.zeros(x.shape)
+    for i, xi in enumerate(x):
+        u = (xi - data) / h
+        res[i] = np.sum(kernel(u)) if weights is None else np.dot(weights, kernel(u))
+        if progress is not None:
+            progress((i + 1) / len(x))
+    total = len(data) if weights is None else np.sum(weights)
+    return res / (total * h)
+
+
+# Linear binning: each point splits its weight between the two nearest nodes of
+# the grid linspace(lo, hi, m) in proportion to its distance from them. Points
+# outside [lo, hi] are dropped.
+def linear_binning(data, lo, hi, m, weights=None):
+    data = np.asarray(data, dtype=float)
+    weights = np.ones_like(data) if weights is None else np.asarray(weights, dtype=float)
+    inside = (data >= lo) & (data <= hi)
+    data, weights = data[inside], weights[inside]
+    delta = (hi - lo) / (m - 1)
+    pos = (data - lo) / delta
+    left = np.clip(np.floor(pos).astype(np.int64), 0, m - 2)
+    frac = pos - left
+    counts = np.bincount(left, weights * (1 - frac), minlength=m)
+    counts += np.bincount(left + 1, weights * frac, minlength=m)
+    return counts
+
+
+# Running moments of a stream of chunks: count, mean, sum of squared deviations
+# (merged per chunk with Chan's parallel update), minimum and maximum. Chunks are
+# arrays of values, or (values, weights) pairs, in which case n is the total
+# weight and "rows" the number of values. "n_eff" is the sample size for the
+# rules of thumb: n for counts, Kish's effective n for non-integer weights.
+# Negative weights, or weights with no positive total, raise ValueError.
+def stream_moments(chunks):
+    moments = {"n": 0, "rows": 0, "mean": 0.0, "m2": 0.0, "min": np.inf, "max": -np.inf}
+    sum_sq_weights, counts, weighted = 0.0, True, False
+    for chunk in chunks:
+        values, weights = chunk if isinstance(chunk, tuple) else (chunk, None)
+        if len(values) == 0:
+            continue
+        if weights is None:
+            n_b = len(values)
+            mean_b = values.mean()
+            m2_b = np.sum((values - mean_b)**2)
+            sum_sq_weights += n_b
+        else:
+            check_weights(weights, total=False)
+            weighted = True
+            n_b = weights.sum()
+            if n_b == 0:
+                continue
+            sum_sq_weights += np.dot(weights, weights)
+            counts = counts and bool(np.all(weights == np.round(weights)))
+            mean_b = np.dot(weights, values) / n_b
+            m2_b = np.dot(weights, (values - mean_b)**2)
+        moments["rows"] += len(values)
+        n_a, mean_a = moments["n"], moments["mean"]
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        moments["mean"] = mean_a + delta * n_b / n
+        moments["m2"] += m2_b + delta**2 * n_a * n_b / n
+        moments["n"] = n
+        moments["min"] = min(moments["min"], values.min())
+        moments["max"] = max(moments["max"], values.max())
+    n = moments["n"]
+    if weighted and n <= 0:
+        raise ValueError("Weights must be non-negative, with a positive total.")
+    moments["n_eff"] = n if counts or n == 0 else n**2 / sum_sq_weights
+    # m2 / (n - 1) for counts; m2 / (n (1 - Σw² / n²)) for reliability weights
+    n_eff = moments["n_eff"]
+    moments["std"] = np.sqrt(moments["m2"] * n_eff / (n * (n_eff - 1))) if n_eff > 1 else 0.0
+    return moments
+
+
+# Linear binning of a stream of chunks (arrays, or (values, weights) pairs) onto
+# linspace(lo, hi, m); only the m counts are kept in memory. Negative weights
+# raise ValueError.
+def stream_linear_binning(chunks, lo, hi, m):
+    counts = np.zeros(m)
+    for chunk in chunks:
+        values, weights = chunk if isinstance(chunk, tuple) else (chunk, None)
+        if weights is not None:
+            check_weights(weights, total=False)
+        counts += linear_binning(values, lo, hi, m, weights)
+    return counts
+
+
+# Counts on linspace(lo, hi, m) extended with empty nodes at the same spacing
+# until the grid covers [new_lo, new_hi], adding at most max_pad nodes per side.
+# Returns the counts and the bounds of the extended grid. Data binned once over
+# their own range thus serve every bandwidth and plot range.
+def pad_counts(counts, lo, hi, new_lo, new_hi, max_pad=None):
+    counts = np.asarray(counts, dtype=float)
+    delta = (hi - lo) / (len(counts) - 1)
+    left = max(int(np.ceil((lo - new_lo) / delta)), 0)
+    right = max(int(np.ceil((new_hi - hi) / delta)), 0)
+    if max_pad is not None:
+        left, right = min(left, max_pad), min(right, max_pad)
+    return np.pad(counts, (left, right)), lo - left * delta, hi + right * delta
+
+
+# Binned KDE on the grid linspace(lo, hi, m): the kernel is sampled once at the
+# grid offsets and convolved with the bin counts by FFT, O(m log m) regardless
+# of the number of data points
+def binned_kde_from_counts(counts, lo, hi, h, kernel_name):
+    counts = np.asarray(counts, dtype=float)
+    m = len(counts)
+    delta = (hi - lo) / (m - 1)
+    L = min(int(np.ceil(kernel_support[kernel_name] * h / delta)), m - 1)
+    kernel_weights = kernel_options[kernel_name](np.arange(-L, L + 1) * delta / h)
+
+    # Linear (not circular) convolution: pad to a power of two >= m + 2L
+    size = 1 << int(np.ceil(np.log2(m + 2 * L)))
+    conv = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel_weights, size), size)
+    density = conv[L:L + m] / (counts.sum() * h)
+    return np.maximum(density, 0)  # FFT round-off can leave tiny negatives
+
+
+# Binned KDE of raw data; returns the grid and the density on it
+def binned_kde(data, h, kernel_name, lo, hi, m=4096, weights=None):
+    grid = np.linspace(lo, hi, m)
+    counts = linear_binning(data, lo, hi, m, weights)
+    return grid, binned_kde_from_counts(counts, lo, hi, h, kernel_name)
+
+
+# Accuracy bound of the binned KDE against the exact sum, at every grid node.
+# Linear binning replaces K((x - X_i) / h) / h by its linear interpolant between
+# the two grid nodes around X_i, so with node spacing delta:
+#   C² kernels (Gaussian):            |error| <= delta² / (8 h³) * sup|K''|
+#   Lipschitz kernels (Epanechnikov,  |error| <= delta / (2 h²) * Lip(K)
+#   triangular):
+# and the FFT convolution adds only the truncated Gaussian tail beyond 8h.
+# The uniform kernel is discontinuous, so no pointwise bound holds (return inf);
+# use the exact sum or a finer grid for it.
+def binning_error_bound(kernel_name, h, delta):
+    if kernel_name == "Gaussian":
+        return delta**2 / (8 * h**3) / np.sqrt(2 * np.pi) + gaussian_kernel(kernel_support["Gaussian"]) / h
+    elif kernel_name == "Epanechnikov":
+        return delta / (2 * h**2) * 1.5
+    elif kernel_name == "Triangular":
+        return delta / (2 * h**2) * 1.0
+    return np.inf
+
+
+# CDF of the KDE at the points x, i.e. the integral of the density up to x.
+# Data are sorted once; points more than the kernel support below x contribute
+# their full weight through a cumulative sum, and only the points within the
+# support of x are evaluated through the kernel CDF. Work is done in blocks of x
+# so the number of (x, point) pairs held in memory stays bounded.
+def kde_cdf(x, data, h, kernel_name, weights=None, max_pairs=4_000_000):
+    x = np.atleast_1d(np.asarray(x, dtype=float))
+    data = np.asarray(data, dtype=float)
+    order = np.argsort(data)
+    data = data[order]
+    weights = np.ones_like(data) if weights is None else np.asarray(weights, dtype=float)[order]
+    cum_weights = np.concatenate([[0.0], np.cumsum(weights)])
+    cdf = kernel_cdfs[kernel_name]
+    reach = kernel_support[kernel_name] * h
+
+    lo = np.searchsorted(data, x - reach, side="left")
+    hi = np.searchsorted(data, x + reach, side="right")
+    result = cum_weights[lo].copy()
+    pairs = hi - lo
+
+    start = 0
+    while start < len(x):
+        # Grow the block until it would exceed max_pairs (always at least one x)
+        stop = start + max(1, np.searchsorted(np.cumsum(pairs[start:]), max_pairs, side="right"))
+        block_pairs = pairs[start:stop]
+        n_pairs = block_pairs.sum()
+        if n_pairs:
+            owner = np.repeat(np.arange(start, stop), block_pairs)
+            offsets = np.arange(n_pairs) - np.repeat(np.cumsum(block_pairs) - block_pairs, block_pairs)
+            idx = lo[owner] + offsets
+            values = weights[idx] * cdf((x[owner] - data[idx]) / h)
+            result[start:stop] += np.bincount(owner - start, values, minlength=stop - start)
+        start = stop
+    return result / cum_weights[-1]
+
+
+# Probability mass of the KDE in each bin [bins[i], bins[i+1]], from the kernel
+# CDFs in one vectorized pass
+def kde_bin_masses(bins, data, h, kernel_name, weights=None):
+    return np.diff(kde_cdf(bins, data, h, kernel_name, weights))
+
+
+# Accuracy bound of the KDE CDF computed from linearly binned counts (grid nodes
+# used as weighted points in kde_cdf). The kernel CDF is one degree smoother than
+# the kernel, so the interpolation bound is delta² / (8 h²) * sup|K'| for every
+# kernel with a Lipschitz K, and delta / (4 h) for the discontinuous uniform
+# kernel. A bin mass is a difference of two CDF values, so its bound is twice this.
+def cdf_binning_error_bound(kernel_name, h, delta):
+    if kernel_name == "Gaussian":
+        return delta**2 / (8 * h**2) * gaussian_kernel(1.0)
+    elif kernel_name == "Epanechnikov":
+        return delta**2 / (8 * h**2) * 1.5
+    elif kernel_name == "Triangular":
+        return delta**2 / (8 * h**2) * 1.0
+    return delta / (4 * h)
+
+
+# --- Bivariate Gaussian KDE -------------------------------------------------
+# Product Gaussian kernel with bandwidths (hx, hy). Dividing each axis by its
+# bandwidth makes the kernel isotropic, and a 2-D standard Gaussian falls below
+# tol times its peak beyond radius sqrt(-2 ln tol). Cutting the kernel there
+# changes the density anywhere by at most tol / (2π hx hy), i.e. tol times the
+# peak height of one kernel.
+
+# Evaluation below this many points uses the KD-tree by default, the binned FFT above
+TREE_MAX_N = 50_000
+
+
+def gaussian_cutoff_2d(tol):
+    return np.sqrt(-2 * np.log(tol))
+
+
+# Scott's rule for two dimensions, n^(-1/6) times each axis's standard deviation
+# (Silverman's rule gives the same factor when d = 2)
+def bandwidth_2d(x, y, factor=None):
+    if factor is None:
+        factor = len(x) ** (-1 / 6)
+    return factor * np.std(x, ddof=1), factor * np.std(y, ddof=1)
+
+
+# Bilinear binning onto the grid linspace(lo_x, hi_x, mx) × linspace(lo_y, hi_y, my):
+# each point splits its weight between the four surrounding nodes. Points outside
+# the grid are dropped. Returns counts indexed [ix, iy].
+def linear_binning_2d(x, y, lo_x, hi_x, lo_y, hi_y, mx, my, weights=None):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    weights = np.ones_like(x) if weights is None else np.asarray(weights, dtype=float)
+    inside = (x >= lo_x) & (x <= hi_x) & (y >= lo_y) & (y <= hi_y)
+    x, y, weights = x[inside], y[inside], weights[inside]
+    pos_x = (x - lo_x) / ((hi_x - lo_x) / (mx - 1))
+    pos_y = (y - lo_y) / ((hi_y - lo_y) / (my - 1))
+    ix = np.clip(np.floor(pos_x).astype(np.int64), 0, mx - 2)
+    iy = np.clip(np.floor(pos_y).astype(np.int64), 0, my - 2)
+    fx, fy = pos_x - ix, pos_y - iy
+    flat = ix * my + iy
+    counts = np.bincount(flat, weights * (1 - fx) * (1 - fy), minlength=mx * my)
+    counts += np.bincount(flat + my, weights * fx * (1 - fy), minlength=mx * my)
+    counts += np.bincount(flat + 1, weights * (1 - fx) * fy, minlength=mx * my)
+    counts += np.bincount(flat + my + 1, weights * fx * fy, minlength=mx * my)
+    return counts.reshape(mx, my)
+
+
+# Binned bivariate KDE on the grid of linear_binning_2d: the kernel, cut at the
+# tolerance radius, is sampled once at the grid offsets and convolved with the
+# counts by a 2-D FFT, O(mx my log(mx my)) regardless of the number of points
+def kde2d_binned_from_counts(counts, lo_x, hi_x, lo_y, hi_y, hx, hy, tol=1e-3):
+    counts = np.asarray(counts, dtype=float)
+    mx, my = counts.shape
+    dx, dy = (hi_x - lo_x) / (mx - 1), (hi_y - lo_y) / (my - 1)
+    r = gaussian_cutoff_2d(tol)
+    Lx = min(int(np.ceil(r * hx / dx)), mx - 1)
+    Ly = min(int(np.ceil(r * hy / dy)), my - 1)
+    u = np.arange(-Lx, Lx + 1) * dx / hx
+    v = np.arange(-Ly, Ly + 1) * dy / hy
+    kernel_weights = np.outer(gaussian_kernel(u), gaussian_kernel(v))
+    kernel_weights[u[:, None]**2 + v[None, :]**2 > r**2] = 0
+
+    shape = tuple(1 << int(np.ceil(np.log2(n + 2 * L))) for n, L in ((mx, Lx), (my, Ly)))
+    conv = np.fft.irfft2(np.fft.rfft2(counts, shape) * np.fft.rfft2(kernel_weights, shape), shape)
+    density = conv[Lx:Lx + mx, Ly:Ly + my] / (counts.sum() * hx * hy)
+    return np.maximum(density, 0)
+
+
+# Binned bivariate KDE of raw data; returns the grid axes and the density [ix, iy]
+def kde2d_binned(x, y, hx, hy, lo_x, hi_x, lo_y, hi_y, mx=256, my=256, tol=1e-3, weights=None):
+    counts = linear_binning_2d(x, y, lo_x, hi_x, lo_y, hi_y, mx, my, weights)
+    density = kde2d_binned_from_counts(counts, lo_x, hi_x, lo_y, hi_y, hx, hy, tol)
+    return np.linspace(lo_x, hi_x, mx), np.linspace(lo_y, hi_y, my), density
+
+
+# Grid points along one axis for the binned bivariate KDE so that its binning
+# term in kde2d_error_bound stays within tol (spacing h·sqrt(4 tol) on each
+# axis), clipped to [min_points, max_points]
+def kde2d_grid_points(lo, hi, h, tol, min_points=64, max_points=2048):
+    return int(np.clip(np.ceil((hi - lo) / (h * np.sqrt(4 * tol))) + 1, min_points, max_points))
+
+
+# Bivariate KDE at arbitrary points (ex, ey) by KD-tree: only the (point, datum)
+# pairs within the tolerance radius are formed, found with scipy's cKDTree on
+# bandwidth-scaled coordinates. Data are processed in blocks holding at most
+# max_pairs pairs, calling progress(fraction) after each.
+def kde2d_tree(ex, ey, x, y, hx, hy, tol=1e-3, weights=None, max_pairs=4_000_000, progress=None):
+    from scipy.spatial import cKDTree
+
+    points = np.column_stack([np.ravel(ex) / hx, np.ravel(ey) / hy])
+    data = np.column_stack([np.asarray(x, dtype=float) / hx, np.asarray(y, dtype=float) / hy])
+    weights = np.ones(len(data)) if weights is None else np.asarray(weights, dtype=float)
+    r = gaussian_cutoff_2d(tol)
+
+    point_tree = cKDTree(points)
+    pairs = point_tree.query_ball_point(data, r, return_length=True)
+    result = np.zeros(len(points))
+    start = 0
+    while start < len(data):
+        stop = start + max(1, np.searchsorted(np.cumsum(pairs[start:]), max_pairs, side="right"))
+        block = cKDTree(data[start:stop])
+        near = block.sparse_distance_matrix(point_tree, r, output_type="ndarray")
+        result += np.bincount(near["j"], weights[start + near["i"]] * np.exp(-0.5 * near["v"]**2),
+                              minlength=len(points))
+        start = stop
+        if progress is not None:
+            progress(start / len(data))
+    return (result / (weights.sum() * 2 * np.pi * hx * hy)).reshape(np.shape(ex))
+
+
+# Accuracy bound of the bivariate KDE against the untruncated exact sum. The
+# tolerance cut contributes tol / (2π hx hy); bilinear binning on spacings
+# (dx, dy) adds (dx²/hx² + dy²/hy²) / 8 times the same peak height, from
+# sup|∂²K/∂u²| = sup|∂²K/∂v²| = 1 / (2π) for the standard 2-D Gaussian.
+def kde2d_error_bound(hx, hy, tol, dx=0.0, dy=0.0):
+    peak = 1 / (2 * np.pi * hx * hy)
+    return peak * (tol + (dx**2 / hx**2 + dy**2 / hy**2) / 8)
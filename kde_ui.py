@@ -0,0 +1,95 @@
+import numpy as np
+import streamlit as st
+
+# Help text of the weight column selectors
+WEIGHT_HELP = ("Counts or weights of the values, for pre-aggregated or weighted data. Integer counts are "
+               "frequencies; non-integer weights are relative, sized by their effective n.")
+
+
+# Streamed passes over an uploaded file, cached per upload, column and weight
+# column (the file object itself is not hashed)
+def stream_chunks(file, column, weight_column):
+    from data_io import iter_column, iter_columns
+
+    return iter_column(file, column) if weight_column is None else iter_columns(file, [column, weight_column])
+
+
+@st.cache_data(max_entries=4, show_spinner="Reading file...")
+def streamed_moments(file_id, _file, column, weight_column=None):
+    from kde_engine import stream_moments
+
+    return stream_moments(stream_chunks(_file, column, weight_column))
+
+
+@st.cache_data(max_entries=4, show_spinner="Binning file...")
+def streamed_counts(file_id, _file, column, weight_column, lo, hi, m):
+    from kde_engine import stream_linear_binning
+
+    return stream_linear_binning(stream_chunks(_file, column, weight_column), lo, hi, m)
+
+
+# Counts of a streamed upload on a fixed grid of m nodes over the data range (a
+# unit-wide range around a constant column). The grid does not depend on the
+# bandwidth or the plot range, so the file is binned once for all of them, and
+# kde_engine.pad_counts extends the counts as far as the plot needs. Returns
+# the counts and the grid bounds.
+def streamed_range_counts(uploaded_file, column, weight_column, moments, m):
+    lo, hi = moments["min"], moments["max"]
+    if hi == lo:
+        lo, hi = lo - 0.5, hi + 0.5
+    return streamed_counts(uploaded_file.file_id, uploaded_file, column, weight_column, lo, hi, m), lo, hi
+
+
+# Moments of one column of a streamed upload, reporting the rows read; None
+# (with the error shown) when the weights are invalid, which is found as the
+# file streams
+def stream_upload(uploaded_file, column, weight_column, profiler):
+    try:
+        with profiler.timed("parse"):
+            moments = streamed_moments(uploaded_file.file_id, uploaded_file, column, weight_column)
+    except ValueError as e:
+        st.error(str(e))
+        return None
+    if weight_column is None:
+        st.write(f"Streamed {moments['n']} data points.")
+    else:
+        st.write(f"Streamed {moments['rows']} data points (total weight {moments['n']:g}).")
+    return moments
+
+
+# Checks and prepares the loaded data for the estimate: invalid weights are
+# reported (and the data dropped), relative weights are noted with their
+# effective sample size, and repeated values are optionally aggregated into
+# weighted distinct values. Returns (data, weights, n_points), with n_points the
+# data points as loaded (streamed rows, or values before aggregation).
+def prepare_data(data, weights, moments, profiler):
+    if weights is not None:
+        from kde_engine import check_weights
+
+        try:
+            check_weights(weights)
+        except ValueError as e:
+            st.error(str(e))
+            data = weights = None
+
+    # Non-integer weights are relative weights: report the sample size the bandwidth uses
+    if moments is not None and moments["n_eff"] != moments["n"]:
+        st.info(f"Non-integer weights are treated as relative weights "
+                f"(effective sample size {moments['n_eff']:.1f}).")
+    elif weights is not None and not np.all(weights == np.round(weights)):
+        st.info("Non-integer weights are treated as relative weights "
+                f"(effective sample size {np.sum(weights)**2 / np.dot(weights, weights):.1f}).")
+
+    n_points = moments["rows"] if moments is not None else (len(data) if data is not None else 0)
+
+    # Repeated values are evaluated once, weighted by their count
+    if data is not None and len(data) > 0:
+        if st.checkbox("Aggregate repeated values", value=True,
+                       help="Evaluate on the distinct values weighted by their counts: the estimate is the same, "
+                            "and its cost scales with the number of distinct values."):
+            from kde_engine import aggregate_values
+
+            with profiler.timed("aggregate"):
+                data, weights = aggregate_values(data, weights)
+            st.write(f"{len(data)} distinct values.")
+    return data, weights, n_points
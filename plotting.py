@@ -0,0 +1,111 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# Series longer than this are drawn with WebGL (Scattergl) instead of SVG
+WEBGL_THRESHOLD = 5_000
+# Points kept per line series after LTTB downsampling
+MAX_LINE_POINTS = 4_000
+# x-bins per scatter series for min/max decimation (at most two points per bin)
+MAX_SCATTER_BINS = 2_000
+# Bins for pre-aggregated rug and histogram overlays
+RUG_BINS = 1_000
+HISTOGRAM_BINS = 64
+
+
+# Largest-Triangle-Three-Buckets: indices of n_out points of the line (x sorted)
+# that keep its visual shape. The first and last points are always kept; each
+# bucket in between contributes the point forming the largest triangle with the
+# previously kept point and the mean of the next bucket.
+def lttb(x, y, n_out):
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            avg_x = x[stop:edges[i + 2]].mean()
+            avg_y = y[stop:edges[i + 2]].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+
+# Min/max binning: indices of the lowest and highest y in each of n_bins equal
+# x-bins, in x order. Keeps the envelope of a scatter cloud (x need not be sorted).
+def minmax_indices(x, y, n_bins):
+    n = len(x)
+    if n <= 2 * n_bins:
+        return np.arange(n)
+    x_min, x_max = np.min(x), np.max(x)
+    span = x_max - x_min
+    if span == 0:
+        b = np.zeros(n, dtype=np.int64)
+    else:
+        b = np.minimum(((x - x_min) / span * n_bins).astype(np.int64), n_bins - 1)
+    order = np.lexsort((y, b))
+    sorted_bins = b[order]
+    first = np.flatnonzero(np.r_[True, sorted_bins[1:] != sorted_bins[:-1]])
+    last = np.r_[first[1:] - 1, n - 1]
+    keep = np.unique(np.concatenate([order[first], order[last]]))
+    return keep[np.argsort(x[keep], kind="stable")]
+
+
+def _finite(x, y):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    ok = np.isfinite(x) & np.isfinite(y)
+    return (x, y) if ok.all() else (x[ok], y[ok])
+
+
+def _scatter_class(n):
+    return go.Scattergl if n > WEBGL_THRESHOLD else go.Scatter
+
+
+# Line trace, LTTB-downsampled to max_points and drawn with WebGL when long
+def line_trace(x, y, name, max_points=MAX_LINE_POINTS, **kwargs):
+    x, y = _finite(x, y)
+    n = len(x)
+    idx = lttb(x, y, max_points)
+    return _scatter_class(n)(x=x[idx], y=y[idx], mode="lines", name=name, **kwargs)
+
+
+# Marker trace, min/max-decimated per x-bin and drawn with WebGL when large
+def scatter_trace(x, y, name, max_bins=MAX_SCATTER_BINS, **kwargs):
+    x, y = _finite(x, y)
+    n = len(x)
+    idx = minmax_indices(x, y, max_bins)
+    return _scatter_class(n)(x=x[idx], y=y[idx], mode="markers", name=name, **kwargs)
+
+
+# Rug plot pre-aggregated into n_bins: one tick per occupied bin, with the
+# number of points in the hover text
+def rug_trace(values, name="Data points", weights=None, n_bins=RUG_BINS, **kwargs):
+    values = np.asarray(values, dtype=float)
+    counts, edges = np.histogram(values, bins=n_bins, weights=weights)
+    occupied = counts > 0
+    centers = 0.5 * (edges[:-1] + edges[1:])[occupied]
+    return go.Scatter(x=centers, y=np.zeros(len(centers)), mode="markers", name=name,
+                      text=[f"{c:g} points" for c in counts[occupied]], hoverinfo="x+text",
+                      marker=dict(symbol="line-ns-open", size=10, color="black"), **kwargs)
+
+
+# Probability-density histogram computed server-side and sent as bars
+def histogram_trace(values, name="Histogram", weights=None, n_bins=HISTOGRAM_BINS, **kwargs):
+    values = np.asarray(values, dtype=float)
+    density, edges = np.histogram(values, bins=n_bins, weights=weights, density=True)
+    widths = np.diff(edges)
+    return go.Bar(x=edges[:-1] + widths / 2, y=density, width=widths, name=name, **kwargs)
+
+
+# Shaded band between lower and upper over x, drawn as one closed polygon
+def band_trace(x, lower, upper, name, **kwargs):
+    x = np.asarray(x, dtype=float)
+    return go.Scatter(x=np.r_[x, x[::-1]], y=np.r_[upper, lower[::-1]], fill="toself", mode="lines",
+                      line=dict(width=0), name=name, hoverinfo="skip", **kwargs)
@@ -0,0 +1,511 @@
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import curve_fit
+
+# Fit-all mode switches to a process pool from this many points on; below it the
+# pool start-up costs more than the fits
+PARALLEL_MIN_POINTS = 50_000
+# Most resamples whose bootstrap weights are drawn and reduced at a time
+BOOTSTRAP_BATCH = 64
+# Memory for the (batch, n) resample indices and counts (two int64 arrays, 16
+# bytes per point and resample): large data draw fewer resamples at a time,
+# down to one
+BOOTSTRAP_BATCH_BYTES = 64 * 2**20
+# Points of the x grid on which the bootstrap bands are evaluated
+BAND_POINTS = 200
+# Fraction of the bootstrap resamples whose fit must converge for the
+# percentile bands to be reported
+BOOTSTRAP_MIN_SUCCESS = 0.5
+# Seconds between progress reports (and so cancellation checks) while waiting
+# on process-pool workers
+POOL_POLL_INTERVAL = 0.5
+
+# Define fitting functions
+def linear_func(x, a, b):
+    return a * x + b
+
+def quadratic_func(x, a, b, c):
+    return a * x**2 + b * x + c
+
+def cubic_func(x, a, b, c, d):
+    return a * x**3 + b * x**2 + c * x + d
+
+def power_law_func(x, a, b):
+    return a * x**b
+
+def exponential_func(x, a, b):
+    return a * np.exp(b * x)
+
+def logarithmic_func(x, a, b):
+    return a + b * np.log(x)
+
+# Analytic Jacobians (columns: d/da, d/db) of the non-linear models
+def power_law_jac(x, a, b):
+    x_b = x**b
+    return np.column_stack([x_b, a * x_b * np.log(x)])
+
+def exponential_jac(x, a, b):
+    e_bx = np.exp(b * x)
+    return np.column_stack([e_bx, a * x * e_bx])
+
+def logarithmic_jac(x, a, b):
+    return np.column_stack([np.ones_like(x, dtype=float), np.log(x)])
+
+model_jacobians = {
+    "Power Law": power_law_jac,
+    "Exponential": exponential_jac,
+    "Logarithmic": logarithmic_jac
+}
+
+# Mapping of models to functions and LaTeX bases
+model_map = {
+    "Linear": (linear_func, r"y = ax + b", [1.0, 1.0], True),
+    "Quadratic": (quadratic_func, r"y = ax^2 + bx + c", [1.0, 1.0, 1.0], True),
+    "Cubic": (cubic_func, r"y = ax^3 + bx^2 + cx + d", [1.0, 1.0, 1.0, 1.0], True),
+    "Power Law": (power_law_func, r"y = a x^{b}", [1.0, 1.0], False),
+    "Exponential": (exponential_func, r"y = a e^{bx}", [1.0, 0.1], False),
+    "Logarithmic": (logarithmic_func, r"y = a + b \ln(x)", [1.0, 1.0], False)
+}
+
+# Models fitted by linear least squares, which can be accumulated over chunks
+polynomial_models = [name for name, (_, _, _, use_polyfit) in model_map.items() if use_polyfit]
+
+
+# LaTeX equation of a polynomial from np.polyfit coefficients (highest power first)
+def polynomial_latex(coeffs):
+    degree = len(coeffs) - 1
+    terms = []
+    for i, coeff in enumerate(coeffs):
+        if coeff != 0:
+            power = degree - i
+            if power == 0:
+                terms.append(f"{coeff:.4f}")
+            elif power == 1:
+                terms.append(f"{coeff:.4f}x")
+            else:
+                terms.append(f"{coeff:.4f}x^{{{power}}}")
+    return r"y = " + " + ".join(terms).replace("+ -", "- ")
+
+
+# LaTeX equation of a fitted non-linear model
+def nonlinear_latex(model_name, popt):
+    params = [f"{param:.4f}" for param in popt]
+    if model_name == "Power Law":
+        return r"y = " + params[0] + r" x^{" + params[1] + r"}"
+    elif model_name == "Exponential":
+        return r"y = " + params[0] + r" e^{" + params[1] + r"x}"
+    elif model_name == "Logarithmic":
+        return r"y = " + params[0] + r" + " + params[1] + r" \ln(x)"
+    return model_map[model_name][1]  # Fallback
+
+
+# Closed-form starting values for the non-linear models from their linearized
+# forms: ln y = ln a + b ln x (power law), ln y = ln a + b x (exponential), and
+# y = a + b ln x (logarithmic, exact). Falls back to the fixed p0 when the data
+# do not allow the transform (non-positive x, or y of mixed sign).
+def initial_guess(model_name, x, y):
+    p0 = model_map[model_name][2]
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    sign = 1.0 if np.all(y > 0) else (-1.0 if np.all(y < 0) else 0.0)
+    if model_name == "Power Law" and sign and np.all(x > 0):
+        b, ln_a = np.polyfit(np.log(x), np.log(sign * y), 1)
+        return [sign * np.exp(ln_a), b]
+    elif model_name == "Exponential" and sign:
+        b, ln_a = np.polyfit(x, np.log(sign * y), 1)
+        return [sign * np.exp(ln_a), b]
+    elif model_name == "Logarithmic" and np.all(x > 0):
+        b, a = np.polyfit(np.log(x), y, 1)
+        return [a, b]
+    return p0
+
+
+# Coefficient of determination
+def r_squared(y, y_fit):
+    ss_res = np.sum((y - y_fit)**2)
+    ss_tot = np.sum((y - np.mean(y))**2)
+    return 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
+
+
+# Akaike information criterion for least squares with k fitted parameters
+def aic(y, y_fit, k):
+    n = len(y)
+    ss_res = np.sum((y - y_fit)**2)
+    return n * np.log(ss_res / n) + 2 * k if ss_res > 0 else -np.inf
+
+
+# Fit one model; returns the parameters, fitted values, R², AIC, LaTeX equation
+# and the number of function evaluations (None for the direct polynomial solve).
+# For the non-linear models progress(fraction) is called before each function
+# evaluation, with the fraction of MINPACK's default evaluation budget used, so
+# a progress callback that raises stops the fit between iterations.
+def fit_model(x, y, model_name, progress=None):
+    func, latex_base, p0, use_polyfit = model_map[model_name]
+    if use_polyfit:
+        # Use np.polyfit for polynomials
+        params = np.polyfit(x, y, len(p0) - 1)
+        y_fit = np.polyval(params, x)
+        latex_eq = polynomial_latex(params)
+        nfev = None
+    else:
+        # Use curve_fit for non-linear models, from the linearized estimate and
+        # with the analytic Jacobian
+        model = func if progress is None else _reporting(func, progress, 100 * (len(p0) + 1))
+        params, _, info, _, _ = curve_fit(model, x, y, p0=initial_guess(model_name, x, y),
+                                          jac=model_jacobians[model_name], full_output=True)
+        y_fit = func(x, *params)
+        latex_eq = nonlinear_latex(model_name, params)
+        nfev = int(info["nfev"])
+    return {"params": params, "y_fit": y_fit, "r2": r_squared(y, y_fit),
+            "aic": aic(y, y_fit, len(params)), "latex_eq": latex_eq, "nfev": nfev}
+
+
+# func calling progress(evaluations / budget) before each evaluation
+def _reporting(func, progress, budget):
+    evaluations = 0
+
+    def model(x, *params):
+        nonlocal evaluations
+        evaluations += 1
+        progress(min(evaluations / budget, 1.0))
+        return func(x, *params)
+    return model
+
+
+def _fit_or_error(x, y, model_name, progress=None):
+    try:
+        return fit_model(x, y, model_name, progress)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+# Raised in a pool worker once the run it belongs to is cancelled
+class _Cancelled(BaseException):
+    pass
+
+
+# The progress callback of a pool worker: it reports nothing back, but raises
+# _Cancelled once the shared cancel event is set
+class _CancelCheck:
+    def __init__(self, event):
+        self.event = event
+
+    def __call__(self, fraction):
+        if self.event.is_set():
+            raise _Cancelled()
+
+
+# Worker processes and the manager holding the cancel events, started on first
+# use and kept for the life of the process (per max_workers). They are started
+# from a fork server (spawned where there is none) rather than forked: the
+# callers run on threads of a multi-threaded server, and a forked child can
+# inherit locks that other threads held at the time of the fork.
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+_pools = {}
+_manager = None
+_pool_lock = threading.Lock()
+
+
+def _process_pool(max_workers=None):
+    global _manager
+    with _pool_lock:
+        context = multiprocessing.get_context(_START_METHOD)
+        if _manager is None:
+            _manager = context.Manager()
+        if max_workers not in _pools:
+            _pools[max_workers] = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+        return _pools[max_workers], _manager
+
+
+# Drop a pool whose worker died, so the next call starts a new one
+def _discard_pool(max_workers, pool):
+    with _pool_lock:
+        if _pools.get(max_workers) is pool:
+            del _pools[max_workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Run func(*args, progress=...) for each args in `calls` in the process pool and
+# return the results in order; sizes weight each call's share of the work.
+# progress(fraction) is called every POOL_POLL_INTERVAL, and when it raises
+# (e.g. the job was cancelled) a cancel event shared with this call's workers
+# stops the running calls at their next progress check, calls not yet started
+# are dropped, and the exception propagates once the workers have stopped.
+def _map_in_pool(func, calls, sizes, max_workers=None, progress=None):
+    pool, manager = _process_pool(max_workers)
+    cancel = manager.Event()
+    try:
+        futures = [pool.submit(func, *args, progress=_CancelCheck(cancel)) for args in calls]
+        pending = set(futures)
+        try:
+            while pending:
+                _, pending = wait(pending, timeout=POOL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                if progress is not None:
+                    progress(sum(size for future, size in zip(futures, sizes) if future.done()) / sum(sizes))
+        except BaseException:
+            cancel.set()
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            raise
+        return [future.result() for future in futures]
+    except BrokenProcessPool:
+        _discard_pool(max_workers, pool)
+        raise
+
+
+# Fit every model in model_map, in a process pool for large data. Returns the
+# per-model results and a table ranked by AIC (then R²); failed fits are listed
+# last with their error. progress(fraction) is called as the fits run; when it
+# raises, the fits stop at their next function evaluation.
+def fit_all_models(x, y, parallel=None, max_workers=None, progress=None):
+    names = list(model_map)
+    if parallel is None:
+        parallel = len(x) >= PARALLEL_MIN_POINTS
+    if parallel:
+        fits = _map_in_pool(_fit_or_error, [(x, y, name) for name in names], [1] * len(names), max_workers,
+                            progress)
+        results = dict(zip(names, fits))
+    else:
+        results = {}
+        for i, name in enumerate(names):
+            # This model's share of the overall progress
+            step = None if progress is None else (lambda fraction, i=i: progress((i + fraction) / len(names)))
+            results[name] = _fit_or_error(x, y, name, step)
+            if progress is not None:
+                progress(len(results) / len(names))
+
+    rows = []
+    for name, result in results.items():
+        if "error" in result:
+            rows.append({"Model": name, "R²": np.nan, "AIC": np.nan, "Parameters": "",
+                         "Evaluations": None, "Error": result["error"]})
+        else:
+            rows.append({"Model": name, "R²": result["r2"], "AIC": result["aic"],
+                         "Parameters": ", ".join(f"{p:.4g}" for p in result["params"]),
+                         "Evaluations": result["nfev"], "Error": ""})
+    table = pd.DataFrame(rows).sort_values(["AIC", "R²"], ascending=[True, False], na_position="last")
+    return results, table.reset_index(drop=True)
+
+
+# Matrix taking the coefficients of a polynomial in t = (x - center) / scale
+# (lowest power first) to its coefficients in x, highest power first (as
+# np.polyfit)
+def scaled_to_raw(degree, center, scale):
+    domain = [center - scale, center + scale]
+    m = np.zeros((degree + 1, degree + 1))
+    for k in range(degree + 1):
+        raw = np.polynomial.Polynomial(np.eye(degree + 1)[k], domain=domain, window=[-1, 1]).convert().coef
+        m[:len(raw), k] = raw
+    return m[::-1]
+
+
+# Least-squares polynomial fit accumulated over chunks of data. The state is the
+# R factor of the QR decomposition of the augmented matrix [V | y], with V the
+# Vandermonde matrix in t = (x - center) / scale (columns 1, t, ..., t^d), plus
+# the count, mean and sum of squared deviations of y. It is (d + 2)² numbers
+# whatever the amount of data: an update costs O(chunk · d²), the last diagonal
+# entry of R is the residual norm (so R² needs no second pass), and states from
+# separate workers merge by stacking their R factors. center and scale default
+# to the mid-range and half-range of the first chunk.
+class IncrementalPolyFit:
+    def __init__(self, degree, center=None, scale=None):
+        self.degree = degree
+        self.center = center
+        self.scale = scale
+        self.r = np.zeros((0, degree + 2))
+        self.n = 0
+        self.y_mean = 0.0
+        self.y_m2 = 0.0
+        self.x_min = np.inf
+        self.x_max = -np.inf
+
+    def update(self, x, y):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if len(x) == 0:
+            return self
+        if self.center is None:
+            lo, hi = x.min(), x.max()
+            self.center = (lo + hi) / 2
+            self.scale = (hi - lo) / 2 or 1.0
+        t = (x - self.center) / self.scale
+        self._add_rows(np.column_stack([np.vander(t, self.degree + 1, increasing=True), y]))
+        y_mean = y.mean()
+        self._add_moments(len(y), y_mean, np.sum((y - y_mean)**2), x.min(), x.max())
+        return self
+
+    # Add another state (e.g. from a parallel worker) to this one
+    def merge(self, other):
+        if other.degree != self.degree:
+            raise ValueError("Cannot merge fits of different degrees.")
+        if other.n == 0:
+            return self
+        if self.center is None:
+            self.center, self.scale = other.center, other.scale
+        rows = other.r
+        if (other.center, other.scale) != (self.center, self.scale):
+            rows = rows @ self._basis_change(other.center, other.scale)
+        self._add_rows(rows)
+        self._add_moments(other.n, other.y_mean, other.y_m2, other.x_min, other.x_max)
+        return self
+
+    def _add_rows(self, rows):
+        self.r = np.linalg.qr(np.vstack([self.r, rows]), mode="r")
+
+    # Chan et al. pairwise update of the y moments
+    def _add_moments(self, n_b, mean_b, m2_b, x_min, x_max):
+        n = self.n + n_b
+        delta = mean_b - self.y_mean
+        self.y_mean += delta * n_b / n
+        self.y_m2 += m2_b + delta**2 * self.n * n_b / n
+        self.n = n
+        self.x_min = min(self.x_min, x_min)
+        self.x_max = max(self.x_max, x_max)
+
+    # Matrix taking [V | y] in the basis of (center, scale) to this state's
+    # basis: with t = a u + b, t^k = sum_j C(k, j) a^j b^(k-j) u^j
+    def _basis_change(self, center, scale):
+        a = scale / self.scale
+        b = (center - self.center) / self.scale
+        m = np.zeros((self.degree + 2, self.degree + 2))
+        for k in range(self.degree + 1):
+            for j in range(k + 1):
+                m[j, k] = math.comb(k, j) * a**j * b**(k - j)
+        m[-1, -1] = 1.0
+        return m
+
+    # Coefficients in x, highest power first (as np.polyfit)
+    def coefficients(self):
+        p = self.degree + 1
+        if self.n < p:
+            raise ValueError(f"At least {p} points are needed for a degree-{self.degree} fit.")
+        coef = np.linalg.lstsq(self.r[:p, :p], self.r[:p, p], rcond=None)[0]
+        return scaled_to_raw(self.degree, self.center, self.scale) @ coef
+
+    def r2(self):
+        ss_res = self.r[-1, -1]**2 if len(self.r) == self.degree + 2 else 0.0
+        return 1 - ss_res / self.y_m2 if self.y_m2 != 0 else 0
+
+    def result(self):
+        params = self.coefficients()
+        return {"params": params, "r2": self.r2(), "latex_eq": polynomial_latex(params), "n": self.n}
+
+
+# Accumulate a polynomial model over a stream of (x, y) chunks
+def fit_chunks(chunks, model_name, center=None, scale=None):
+    fit = IncrementalPolyFit(len(model_map[model_name][2]) - 1, center, scale)
+    for x, y in chunks:
+        fit.update(x, y)
+    return fit
+
+
+# Polynomial bootstrap as one batched problem. With t = (x - center) / scale the
+# normal equations of a resample with multinomial counts w are sums of w·t^k
+# (k ≤ 2d) and w·t^k·y (k ≤ d), so all resamples reduce to one (B, n) @ (n, 3d + 2)
+# product, solved as B small systems. Returns the coefficients in t.
+def _bootstrap_polynomial(t, y, degree, n_resamples, rng, progress=None):
+    n = len(t)
+    powers = np.vander(t, 2 * degree + 1, increasing=True)
+    features = np.column_stack([powers, powers[:, :degree + 1] * y[:, None]])
+    sums = np.empty((n_resamples, features.shape[1]))
+    batch = max(1, min(BOOTSTRAP_BATCH, BOOTSTRAP_BATCH_BYTES // (16 * n)))
+    for start in range(0, n_resamples, batch):
+        b = min(batch, n_resamples - start)
+        idx = rng.integers(0, n, size=(b, n)) + (np.arange(b) * n)[:, None]
+        counts = np.bincount(idx.ravel(), minlength=b * n).reshape(b, n)
+        sums[start:start + b] = counts @ features
+        if progress is not None:
+            progress((start + b) / n_resamples)
+    k = np.arange(degree + 1)
+    gram = sums[:, k[:, None] + k[None, :]]
+    rhs = sums[:, 2 * degree + 1:]
+    return np.linalg.solve(gram, rhs[..., None])[..., 0]
+
+
+# Non-linear bootstrap for one worker: refit `n_resamples` resamples with
+# curve_fit, warm-started from the full-data parameters. Failed fits give NaN.
+# progress(fraction) is called after each resample.
+def _bootstrap_nonlinear(x, y, model_name, p0, n_resamples, seed, progress=None):
+    func = model_map[model_name][0]
+    rng = np.random.default_rng(seed)
+    params = np.full((n_resamples, len(p0)), np.nan)
+    for i in range(n_resamples):
+        idx = rng.integers(0, len(x), len(x))
+        try:
+            params[i] = curve_fit(func, x[idx], y[idx], p0=p0, jac=model_jacobians[model_name])[0]
+        except (RuntimeError, ValueError):
+            pass
+        if progress is not None:
+            progress((i + 1) / n_resamples)
+    return params
+
+
+# Bootstrap a model: parameter confidence intervals and, on BAND_POINTS x values
+# over the data range, confidence bands of the fitted curve and prediction bands
+# of new observations (the curve plus a resampled residual), all as percentile
+# intervals at `level`. Polynomials are solved in one batch; non-linear models
+# are refitted in a process pool for large data. progress(fraction) is called
+# as resamples finish (as each worker finishes in the process pool); when it
+# raises, the workers stop at their next resample.
+def bootstrap_fit(x, y, model_name, n_resamples=2000, level=0.95, seed=0, parallel=None, max_workers=None,
+                  progress=None):
+    func, _, p0, use_polyfit = model_map[model_name]
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    base = fit_model(x, y, model_name)
+    x_grid = np.linspace(x.min(), x.max(), BAND_POINTS)
+    rng = np.random.default_rng(seed)
+
+    if use_polyfit:
+        degree = len(p0) - 1
+        center = (x.max() + x.min()) / 2
+        scale = (x.max() - x.min()) / 2 or 1.0
+        coef = _bootstrap_polynomial((x - center) / scale, y, degree, n_resamples, rng, progress)
+        params = coef @ scaled_to_raw(degree, center, scale).T
+        curves = np.vander((x_grid - center) / scale, degree + 1, increasing=True) @ coef.T
+    else:
+        if parallel is None:
+            parallel = len(x) >= PARALLEL_MIN_POINTS
+        seeds = np.random.SeedSequence(seed).spawn(max_workers or os.cpu_count() or 1)
+        sizes = [len(part) for part in np.array_split(np.arange(n_resamples), len(seeds))]
+        parts = []
+        if parallel:
+            parts = _map_in_pool(_bootstrap_nonlinear,
+                                 [(x, y, model_name, base["params"], size, s) for size, s in zip(sizes, seeds)],
+                                 sizes, max_workers, progress)
+        else:
+            for size, s in zip(sizes, seeds):
+                # This worker's share of the overall progress
+                step = None if progress is None else (
+                    lambda fraction, done=sum(len(part) for part in parts), size=size:
+                    progress((done + fraction * size) / n_resamples))
+                parts.append(_bootstrap_nonlinear(x, y, model_name, base["params"], size, s, step))
+        params = np.vstack(parts)
+        params = params[~np.isnan(params).any(axis=1)]
+        # Percentiles over the few resamples that converged would be biased
+        # towards the easy ones
+        if len(params) < max(2, BOOTSTRAP_MIN_SUCCESS * n_resamples):
+            raise ValueError(f"Only {len(params)} of {n_resamples} bootstrap resamples converged; "
+                             "the bands would be unreliable.")
+        curves = func(x_grid[:, None], *params.T)
+
+    residuals = y - base["y_fit"]
+    predictions = curves + rng.choice(residuals, size=curves.shape)
+    tails = [50 * (1 - level), 50 * (1 + level)]
+    return {
+        "params": base["params"],
+        "param_ci": np.percentile(params, tails, axis=0),
+        "x": x_grid,
+        "confidence": np.percentile(curves, tails, axis=1),
+        "prediction": np.percentile(predictions, tails, axis=1),
+        "n_resamples": len(params),
+        "n_requested": n_resamples,
+    }
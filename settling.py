@@ -0,0 +1,261 @@
+import math
+
+import numpy as np
+import pandas as pd
+from scipy.integrate import solve_ivp
+from scipy.optimize import brentq
+
+# Constants
+g = 9.81  # gravitational acceleration (m/s²)
+
+# Convergence criterion of the legacy fixed-step loop: |v_new - v| < epsilon with
+# a step of dt means the particle has "reached" terminal velocity once its
+# acceleration drops below epsilon / dt. The adaptive solver stops on the same
+# condition so t and z stay comparable with the Euler results.
+EULER_DT = 0.001  # time step (s)
+EULER_EPSILON = 1e-6  # convergence criterion for velocity (m/s)
+ACCEL_TOL = EULER_EPSILON / EULER_DT  # stopping acceleration (m/s²)
+# Step limit of the legacy loop (1000 s of settling at EULER_DT); it never
+# converges when Re_p oscillates across the C_D jump at Re_p = 1000
+EULER_MAX_STEPS = 1_000_000
+
+
+# Drag coefficient (piecewise correlation)
+def drag_coefficient(Re_p):
+    if Re_p < 0.1:
+        return 24 / Re_p if Re_p > 0 else 0  # Stokes' Law
+    elif Re_p < 1000:
+        return (24 / Re_p) * (1 + 0.15 * Re_p ** 0.687)  # Intermediate regime
+    return 0.44  # Newton's regime
+
+
+def _particle(d_m, rho_p, rho_f, mu):
+    volume = (4/3) * math.pi * (d_m / 2) ** 3
+    mass = rho_p * volume
+    F_net_grav = (rho_p - rho_f) * volume * g  # weight minus buoyancy
+    area = math.pi * (d_m / 2) ** 2
+
+    def reynolds(v):
+        return (rho_f * v * d_m) / mu if mu > 0 else 0
+
+    def drag_force(v):
+        return 0.5 * rho_f * v ** 2 * drag_coefficient(reynolds(v)) * area
+
+    return mass, F_net_grav, reynolds, drag_force
+
+
+# Velocity at which drag balances a net force of F_net_grav * (1 - accel_frac)
+def _balance_velocity(d_m, mu, drag_force, F_target):
+    if F_target <= 0:
+        return 0.0
+    # Every regime of the correlation has C_D >= 24 / Re_p, so the Stokes velocity
+    # bounds the root from above (doubled so the sign change survives round-off
+    # when the root is the Stokes velocity itself).
+    v_stokes = F_target / (3 * math.pi * mu * d_m)
+    return brentq(lambda v: drag_force(v) - F_target, 0.0, 2 * v_stokes,
+                  xtol=1e-15, rtol=1e-12)
+
+
+# Terminal velocity from the force balance F_net_grav = F_d(v)
+def terminal_velocity(d_m, rho_p, rho_f, mu):
+    mass, F_net_grav, reynolds, drag_force = _particle(d_m, rho_p, rho_f, mu)
+    return _balance_velocity(d_m, mu, drag_force, F_net_grav)
+
+
+# Adaptive solver: root-find the terminal velocity, then integrate
+# m dv/dt = F_net_grav - F_d(v) until the acceleration falls below accel_tol
+def settling_adaptive(d_m, rho_p, rho_f, mu, accel_tol=ACCEL_TOL):
+    mass, F_net_grav, reynolds, drag_force = _particle(d_m, rho_p, rho_f, mu)
+    v_t = _balance_velocity(d_m, mu, drag_force, F_net_grav)
+    Re_p = reynolds(v_t)
+    C_D = drag_coefficient(Re_p)
+
+    a_0 = F_net_grav / mass if mass > 0 else 0
+    if a_0 <= accel_tol:
+        return {"Re_p": Re_p, "C_D": C_D, "v_t": v_t, "t": 0.0, "z": 0.0}
+
+    # The acceleration decreases monotonically with v, so "a < accel_tol" is the
+    # same as "v > v_e". The velocity event stays smooth even when v_t sits on a
+    # jump of the C_D correlation, where the acceleration never crosses accel_tol.
+    v_e = _balance_velocity(d_m, mu, drag_force, F_net_grav - mass * accel_tol)
+    v_e = min(v_e, v_t * (1 - 1e-12))
+
+    def rhs(t, state):
+        v = state[0]
+        return [max(F_net_grav - drag_force(v), 0.0) / mass, v]
+
+    def reached_terminal(t, state):
+        return state[0] - v_e
+    reached_terminal.terminal = True
+    reached_terminal.direction = 1
+
+    # Time scale of the approach: exponential in the Stokes regime, tanh-like in
+    # the Newton regime. Both reach accel_tol well within this horizon.
+    tau = v_t / a_0
+    t_max = 4 * tau * (math.log(a_0 / accel_tol) + 2)
+    sol = solve_ivp(rhs, (0.0, t_max), [0.0, 0.0], method="RK45",
+                    events=reached_terminal, rtol=1e-8, atol=[1e-12 * v_t, 1e-12])
+    if sol.t_events[0].size:
+        t, (v, z) = sol.t_events[0][0], sol.y_events[0][0]
+    else:
+        t, (v, z) = sol.t[-1], sol.y[:, -1]
+    return {"Re_p": Re_p, "C_D": C_D, "v_t": v_t, "t": float(t), "z": float(z)}
+
+
+# Legacy fixed-step explicit Euler simulation; raises RuntimeError if the
+# velocity has not converged within max_steps steps
+def settling_euler(d_m, rho_p, rho_f, mu, dt=EULER_DT, epsilon=EULER_EPSILON, max_steps=EULER_MAX_STEPS):
+    mass, F_net_grav, reynolds, drag_force = _particle(d_m, rho_p, rho_f, mu)
+
+    # Simulation loop
+    v = 1e-12  # initial velocity (m/s)
+    z = 0  # initial position (m)
+    t = 0  # initial time (s)
+    for _ in range(max_steps):
+        Re_p = reynolds(v)
+        C_D = drag_coefficient(Re_p)
+        F_d = drag_force(v)
+
+        # Net force and acceleration
+        F_net = F_net_grav - F_d  # drag opposes gravity
+        a = F_net / mass if mass > 0 else 0
+
+        # Update velocity and position
+        v_new = v + a * dt
+        z += v * dt
+        t += dt
+
+        # Check for convergence
+        if abs(v_new - v) < epsilon:
+            break
+
+        v = v_new
+    else:
+        raise RuntimeError(f"The Euler solver did not converge within {max_steps} steps "
+                           f"(Re_p = {Re_p:.1f}); use the adaptive solver.")
+
+    return {"Re_p": Re_p, "C_D": C_D, "v_t": v, "t": t, "z": z}
+
+
+# Vectorized drag coefficient (same piecewise correlation, applied with masks)
+def drag_coefficient_array(Re_p):
+    Re_p = np.asarray(Re_p, dtype=float)
+    C_D = np.full(Re_p.shape, 0.44)  # Newton's regime
+    stokes = Re_p < 0.1
+    intermediate = ~stokes & (Re_p < 1000)
+    positive = stokes & (Re_p > 0)
+    C_D[stokes] = 0
+    C_D[positive] = 24 / Re_p[positive]  # Stokes' Law
+    Re_i = Re_p[intermediate]
+    C_D[intermediate] = (24 / Re_i) * (1 + 0.15 * Re_i ** 0.687)  # Intermediate regime
+    return C_D
+
+
+# C_D * Re_p^2 in the intermediate regime
+def _intermediate_cd_re2(Re_p):
+    return 24 * Re_p * (1 + 0.15 * Re_p ** 0.687)
+
+
+# Regime boundaries of C_D * Re_p^2. The correlation jumps upwards at Re_p = 0.1
+# and Re_p = 1000, so targets falling inside a jump settle exactly on the boundary
+# (the same point the scalar root-finder converges to).
+_STOKES_LIMIT = 24 * 0.1
+_INTERMEDIATE_LOW = _intermediate_cd_re2(0.1)
+_INTERMEDIATE_HIGH = _intermediate_cd_re2(1000.0)
+_NEWTON_LOW = 0.44 * 1000.0 ** 2
+
+
+# Invert C_D(Re_p) * Re_p^2 = X for Re_p element-wise
+def _reynolds_from_cd_re2(X):
+    Re_p = np.zeros_like(X)
+    stokes = (X > 0) & (X < _STOKES_LIMIT)
+    Re_p[stokes] = X[stokes] / 24
+    Re_p[(X >= _STOKES_LIMIT) & (X < _INTERMEDIATE_LOW)] = 0.1
+    intermediate = (X >= _INTERMEDIATE_LOW) & (X < _INTERMEDIATE_HIGH)
+    Re_p[(X >= _INTERMEDIATE_HIGH) & (X < _NEWTON_LOW)] = 1000.0
+    newton = X >= _NEWTON_LOW
+    Re_p[newton] = np.sqrt(X[newton] / 0.44)
+
+    # Intermediate regime: C_D * Re_p^2 is increasing and convex in Re_p, so Newton
+    # iterations started to the right of the root decrease monotonically onto it
+    X_i = X[intermediate]
+    Re_i = np.minimum(X_i / 24, 1000.0)
+    for _ in range(100):
+        f = _intermediate_cd_re2(Re_i) - X_i
+        df = 24 + 0.15 * 24 * 1.687 * Re_i ** 0.687
+        step = f / df
+        Re_i = Re_i - step
+        if np.all(np.abs(step) <= 1e-14 * Re_i):
+            break
+    Re_p[intermediate] = Re_i
+    return Re_p
+
+
+# Gauss-Legendre nodes and weights on [0, 1] for the time/distance quadrature
+_GL_NODES, _GL_WEIGHTS = np.polynomial.legendre.leggauss(24)
+_GL_NODES = 0.5 * (_GL_NODES + 1)
+_GL_WEIGHTS = 0.5 * _GL_WEIGHTS
+
+
+def _settling_chunk(d_m, rho_p, rho_f, mu, accel_tol):
+    delta_rho = rho_p - rho_f
+    # Force balance F_d = F_net_grav written as C_D * Re_p^2 = (4/3) * Archimedes number
+    X = (4/3) * rho_f * delta_rho * g * d_m ** 3 / mu ** 2
+    Re_p = _reynolds_from_cd_re2(X)
+    C_D = drag_coefficient_array(Re_p)
+    v_scale = mu / (rho_f * d_m)  # Re_p -> velocity
+    v_t = Re_p * v_scale
+
+    # Acceleration at rest; the simulation stops once it has decayed to accel_tol,
+    # i.e. once drag has reached F_net_grav * (1 - accel_tol / a_0)
+    a_0 = delta_rho * g / rho_p
+    moving = a_0 > accel_tol
+    frac = np.where(moving, 1 - accel_tol / np.where(moving, a_0, 1), 0)
+    v_e = _reynolds_from_cd_re2(X * frac) * v_scale
+    r_e = np.clip(v_e / np.where(v_t > 0, v_t, 1), 0, 1 - 1e-12)
+
+    # t = int dv / a(v) and z = int v dv / a(v) from 0 to v_e, substituting
+    # u = -ln(1 - v / v_t). The integrand is then constant in the Stokes regime
+    # and smooth elsewhere; each regime gets its own Gauss-Legendre segment.
+    u_e = -np.log1p(-r_e)
+    breaks = [np.zeros_like(u_e)]
+    for Re_b in (0.1, 1000.0):
+        r_b = np.clip(Re_b * v_scale / np.where(v_t > 0, v_t, 1), 0, 1)
+        breaks.append(np.minimum(-np.log1p(-np.minimum(r_b, 1 - 1e-12)), u_e))
+    breaks.append(u_e)
+    lo = np.stack(breaks[:-1], axis=1)[:, :, None]
+    width = np.diff(np.stack(breaks, axis=1), axis=1)[:, :, None]
+    u = lo + width * _GL_NODES
+    w = width * _GL_WEIGHTS
+
+    v_t3 = v_t[:, None, None]
+    one_minus_r = np.exp(-u)
+    v = v_t3 * (1 - one_minus_r)
+    Re_v = v / v_scale[:, None, None]
+    drag_ratio = drag_coefficient_array(Re_v) * Re_v ** 2 / np.where(X > 0, X, 1)[:, None, None]
+    a = a_0[:, None, None] * (1 - drag_ratio)
+    dt_du = v_t3 * one_minus_r / np.where(a > 0, a, np.inf)
+    t = np.where(moving, np.sum(w * dt_du, axis=(1, 2)), 0)
+    z = np.where(moving, np.sum(w * dt_du * v, axis=(1, 2)), 0)
+    return Re_p, C_D, v_t, t, z
+
+
+# Vectorized settling engine for arrays of particles (SI inputs);
+# progress(fraction) is called after each chunk
+def settling_batch(d_m, rho_p, rho_f, mu, accel_tol=ACCEL_TOL, chunk_size=16384, progress=None):
+    d_m, rho_p, rho_f, mu = np.broadcast_arrays(*(np.asarray(a, dtype=float).ravel()
+                                                  for a in (d_m, rho_p, rho_f, mu)))
+    n = d_m.size
+    out = {name: np.full(n, np.nan) for name in ("Re_p", "C_D", "v_t", "t", "z")}
+
+    # Rows with non-physical inputs are left as NaN
+    valid = (d_m > 0) & (rho_p > 0) & (rho_f > 0) & (mu > 0) & (rho_p > rho_f)
+    idx = np.flatnonzero(valid)
+    for start in range(0, idx.size, chunk_size):
+        sel = idx[start:start + chunk_size]
+        results = _settling_chunk(d_m[sel], rho_p[sel], rho_f[sel], mu[sel], accel_tol)
+        for name, values in zip(out, results):
+            out[name][sel] = values
+        if progress is not None:
+            progress((start + len(sel)) / idx.size)
+    return pd.DataFrame(out)
@@ -0,0 +1,75 @@
+import functools
+
+import numpy as np
+
+# IAPWS-IF97 region 4 (saturation line). The backward equation T_s(p), Eq. (31)
+# of the IF97 release, with p in MPa and T in K.
+N = np.array([
+    0.11670521452767e4, -0.72421316703206e6, -0.17073846940092e2, 0.12020824702470e5,
+    -0.32325550322333e7, 0.14915108613530e2, -0.48232657361591e4, 0.40511340542057e6,
+    -0.23855557567849, 0.65017534844798e3,
+])
+
+# Validity range of the saturation line: triple point to critical point (Pa)
+P_MIN = 611.213
+P_MAX = 22.064e6
+
+# Default number of nodes of the lookup table, uniform in ln P
+TABLE_NODES = 4096
+
+
+# Saturation temperature (K) from pressure (Pa) by the IF97 backward equation.
+# Works element-wise on arrays; pressures outside [P_MIN, P_MAX] give NaN.
+def saturation_temperature(pressure):
+    p = np.asarray(pressure, dtype=float)
+    in_range = (p >= P_MIN) & (p <= P_MAX)
+    beta = np.where(in_range, p / 1e6, 1.0) ** 0.25
+    n1, n2, n3, n4, n5, n6, n7, n8, n9, n10 = N
+    E = beta**2 + n3 * beta + n6
+    F = n1 * beta**2 + n4 * beta + n7
+    G = n2 * beta**2 + n5 * beta + n8
+    D = 2 * G / (-F - np.sqrt(F**2 - 4 * E * G))
+    t_sat = (n10 + D - np.sqrt((n10 + D)**2 - 4 * (n9 + n10 * D))) / 2
+    return np.where(in_range, t_sat, np.nan)
+
+
+# Precomputed table of the IF97 saturation temperature, linear in ln P between
+# nodes. The interpolant is monotone (T_s(p) is increasing and linear pieces
+# never overshoot their nodes), and max_error bounds its deviation from the
+# backward equation: linear interpolation on a step h errs by at most
+# h²/8 · max|f''| over each interval, with f(u) = T_s(e^u). f'' is sampled from
+# the equation at `oversample` points per interval, both ends included.
+class SaturationTable:
+    def __init__(self, n_nodes=TABLE_NODES, oversample=16):
+        self.ln_p = np.linspace(np.log(P_MIN), np.log(P_MAX), n_nodes)
+        self.t_sat = saturation_temperature(np.clip(np.exp(self.ln_p), P_MIN, P_MAX))
+        self.step = self.ln_p[1] - self.ln_p[0]
+
+        # Second derivative by central differences on the finer grid
+        def f(u):
+            return saturation_temperature(np.clip(np.exp(u), P_MIN, P_MAX))
+
+        du = 1e-4
+        fine = np.linspace(self.ln_p[0], self.ln_p[-1], (n_nodes - 1) * oversample + 1)
+        fine = np.clip(fine, self.ln_p[0] + du, self.ln_p[-1] - du)
+        f2 = np.abs(f(fine + du) - 2 * f(fine) + f(fine - du)) / du**2
+        per_interval = np.maximum(f2[:-1].reshape(n_nodes - 1, oversample).max(axis=1),
+                                  f2[oversample::oversample])
+        self.max_error = float(self.step**2 / 8 * per_interval.max())
+
+    # Saturation temperature (K) from pressure (Pa); NaN outside [P_MIN, P_MAX]
+    def __call__(self, pressure):
+        p = np.asarray(pressure, dtype=float)
+        in_range = (p >= P_MIN) & (p <= P_MAX)
+        # Uniform nodes: the interval index is computed directly, no search
+        pos = (np.log(np.where(in_range, p, P_MIN)) - self.ln_p[0]) / self.step
+        i = np.minimum(pos.astype(np.intp), len(self.ln_p) - 2)
+        w = pos - i
+        t_sat = (1 - w) * self.t_sat[i] + w * self.t_sat[i + 1]
+        return np.where(in_range, t_sat, np.nan)
+
+
+# Shared default table, built on first use
+@functools.lru_cache(maxsize=None)
+def default_table():
+    return SaturationTable()
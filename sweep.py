@@ -0,0 +1,107 @@
+import argparse
+
+import numpy as np
+
+from engine import CALCULATIONS
+from units import from_si, si_unit, to_si
+
+# Largest grid evaluated by one sweep
+MAX_POINTS = 10_000_000
+
+
+# Values of one swept input from text:
+#   "1, 2, 5"        the listed values
+#   "0.1:10:50"      50 values evenly spaced from 0.1 to 10, both included
+#   "0.1:10:50 log"  50 values evenly spaced in log from 0.1 to 10
+def parse_values(text):
+    text = text.strip()
+    if ":" in text:
+        spec, _, scale = text.partition(" ")
+        parts = spec.split(":")
+        if len(parts) != 3:
+            raise ValueError(f"Expected start:stop:count, got {text!r}")
+        start, stop, num = float(parts[0]), float(parts[1]), int(parts[2])
+        if num < 1:
+            raise ValueError(f"The count of a range must be at least 1, got {num}")
+        scale = scale.strip()
+        if scale == "log":
+            if start <= 0 or stop <= 0:
+                raise ValueError("A log range needs positive bounds")
+            return np.geomspace(start, stop, num)
+        elif scale not in ("", "lin"):
+            raise ValueError(f"Unknown range scale {scale!r} (use 'lin' or 'log')")
+        return np.linspace(start, stop, num)
+    values = np.array([float(value) for value in text.split(",") if value.strip()])
+    if values.size == 0:
+        raise ValueError("No values given")
+    return values
+
+
+# Evaluate an engine calculation on the Cartesian grid of its inputs' values
+# (input name -> 1-D array, SI). The grid is broadcast from the per-input axes
+# without copies and computed in one vectorized call; each output is an SI array
+# of shape (number of values of each input, in the order of the inputs).
+def run_sweep(calculation, values):
+    spec = CALCULATIONS[calculation]
+    axes = [np.asarray(values[name], dtype=float).ravel() for name in spec["inputs"]]
+    shape = tuple(len(axis) for axis in axes)
+    n_points = int(np.prod(shape))
+    if n_points > MAX_POINTS:
+        raise ValueError(f"The sweep has {n_points} points; the limit is {MAX_POINTS}.")
+    grids = np.broadcast_arrays(*np.meshgrid(*axes, indexing="ij", sparse=True))
+    results = spec["compute"](**dict(zip(spec["inputs"], grids)))
+    return {name: np.asarray(results[name]).reshape(shape) for name in spec["outputs"]}
+
+
+# One row per grid point, with the inputs and outputs in the given units
+# (name -> unit, default SI), columns named as in the batch runner
+def sweep_table(calculation, values, results, units=None):
+    import pandas as pd
+
+    spec = CALCULATIONS[calculation]
+    units = units or {}
+    columns = {}
+    grids = np.meshgrid(*(np.asarray(values[name], dtype=float) for name in spec["inputs"]), indexing="ij")
+    for (name, dimension), grid in zip(spec["inputs"].items(), grids):
+        unit = units.get(name, si_unit(dimension))
+        columns[f"{name} ({unit})"] = from_si(grid.ravel(), unit, dimension)
+    for name, dimension in spec["outputs"].items():
+        if dimension:
+            unit = units.get(name, si_unit(dimension))
+            columns[f"{name} ({unit})"] = from_si(results[name].ravel(), unit, dimension)
+        else:
+            columns[name] = results[name].ravel()
+    return pd.DataFrame(columns)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run an engineering calculation over a grid of inputs.")
+    parser.add_argument("calculation", choices=sorted(CALCULATIONS))
+    parser.add_argument("output", help="output CSV path")
+    parser.add_argument("--values", action="append", metavar="NAME=VALUES",
+                        help="values of an input: a list '1,2,5' or a range 'start:stop:count [log]' (repeatable)")
+    parser.add_argument("--unit", action="append", metavar="NAME=UNIT",
+                        help="unit of an input or output (repeatable, default SI)")
+    args = parser.parse_args(argv)
+    # The batch runner imports pandas, which the sweep UI loads only on demand
+    from batch import parse_pairs
+
+    spec = CALCULATIONS[args.calculation]
+    texts = parse_pairs(args.values)
+    units = parse_pairs(args.unit)
+    missing = [name for name in spec["inputs"] if name not in texts]
+    if missing:
+        parser.error(f"Missing values for: {', '.join(missing)}")
+    try:
+        values = {name: to_si(parse_values(texts[name]), units.get(name, si_unit(dimension)), dimension)
+                  for name, dimension in spec["inputs"].items()}
+        results = run_sweep(args.calculation, values)
+        table = sweep_table(args.calculation, values, results, units)
+    except ValueError as e:
+        parser.error(str(e))
+    table.to_csv(args.output, index=False)
+    print(f"Wrote {len(table)} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
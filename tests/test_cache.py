@@ -0,0 +1,40 @@
+import numpy as np
+
+from cache import LRUCache
+
+
+def test_evicts_least_recently_used_by_count():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicts_by_bytes():
+    block = np.zeros(1000)  # 8000 bytes
+    cache = LRUCache(max_bytes=20_000)
+    for key in "abc":
+        cache.put(key, block.copy())
+    assert cache.get("a") is None
+    assert len(cache) == 2 and cache.nbytes == 2 * block.nbytes
+    # A value larger than the limit is not stored, and evicts nothing
+    cache.put("big", np.zeros(5000))
+    assert cache.get("big") is None
+    assert len(cache) == 2
+
+
+def test_counts_hits_and_misses():
+    cache = LRUCache()
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute("key", lambda: calls.append(1) or 42) == 42
+    cache.get("other")
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+    assert stats["hit_rate"] == 0.5
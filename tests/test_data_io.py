@@ -0,0 +1,59 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from pyarrow import feather
+
+from data_io import columns_of, file_format, iter_column, iter_frames, read_table
+
+# Reading Feather v1 is supported, though pyarrow warns that it is deprecated
+pytestmark = pytest.mark.filterwarnings("ignore:Feather V1 files are deprecated:DeprecationWarning")
+
+FRAME = pd.DataFrame({"a": np.arange(10.0), "b": np.arange(10.0) ** 2, "c": list("abcdefghij")})
+
+
+def _write(fmt, path):
+    table = pa.Table.from_pandas(FRAME, preserve_index=False)
+    if fmt == "parquet":
+        pq.write_table(table, path, row_group_size=4)
+    elif fmt == "feather1":
+        feather.write_feather(FRAME, path, version=1)
+    elif fmt == "arrow":
+        feather.write_feather(table, path, version=2, chunksize=4)
+    else:
+        FRAME.to_csv(path, index=False)
+
+
+# Each format from a path and from an in-memory upload
+@pytest.fixture(params=["parquet", "feather1", "arrow", "csv"])
+def files(request, tmp_path):
+    path = tmp_path / f"data.{request.param}"
+    _write(request.param, path)
+    return request.param, [path, io.BytesIO(path.read_bytes())]
+
+
+def test_file_format(files):
+    fmt, sources = files
+    for source in sources:
+        assert file_format(source) == fmt
+
+
+def test_column_projection(files):
+    _, sources = files
+    for source in sources:
+        assert columns_of(source) == ["a", "b", "c"]
+        # Names and positions, in the requested order
+        df = read_table(source, ["b", 0])
+        assert list(df.columns) == ["b", "a"]
+        pd.testing.assert_frame_equal(df, FRAME[["b", "a"]])
+
+
+def test_streamed_column(files):
+    _, sources = files
+    for source in sources:
+        frames = list(iter_frames(source, ["b"], chunksize=4))
+        assert all(list(frame.columns) == ["b"] and len(frame) <= 4 for frame in frames)
+        np.testing.assert_array_equal(np.concatenate(list(iter_column(source, 1, chunksize=4))), FRAME["b"])
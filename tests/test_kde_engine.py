@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from kde_engine import (aggregate_values, binned_kde_from_counts, binning_error_bound, compute_bandwidth,
+                        gaussian_kernel, kde_func, linear_binning, pad_counts, stream_linear_binning, stream_moments,
+                        weighted_moments)
+
+
+def test_counts_match_raw_samples():
+    raw = np.array([1.0, 2.0, 2.0, 3.0, 3.0, 3.0, 4.0])
+    values, counts = aggregate_values(raw)
+    assert weighted_moments(values, counts) == pytest.approx((len(raw), np.std(raw, ddof=1)))
+    for method in ("scott", "silverman"):
+        assert compute_bandwidth(values, method, weights=counts) == pytest.approx(compute_bandwidth(raw, method))
+
+
+def test_normalized_weights_are_reliability_weights():
+    x = np.arange(1.0, 6.0)
+    w = np.array([0.1, 0.2, 0.4, 0.2, 0.1])
+    n_eff = w.sum()**2 / np.dot(w, w)
+    mean = np.dot(w, x) / w.sum()
+    var = np.dot(w, (x - mean)**2) / (w.sum() * (1 - np.dot(w, w) / w.sum()**2))
+
+    n, std = weighted_moments(x, w)
+    assert n == pytest.approx(n_eff)
+    assert std == pytest.approx(np.sqrt(var))
+    h = compute_bandwidth(x, "scott", weights=w)
+    assert h == pytest.approx(1.059 * np.sqrt(var) * n_eff**(-0.2))
+    # Only the ratios of the weights matter
+    for scale in (0.01, 3.7):
+        assert compute_bandwidth(x, "scott", weights=scale * w) == pytest.approx(h)
+        assert compute_bandwidth(x, "sheather-jones", weights=scale * w) == \
+            pytest.approx(compute_bandwidth(x, "sheather-jones", weights=w))
+
+
+def test_streamed_moments_match_in_memory():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=1000)
+    w = rng.uniform(0.1, 1.0, size=1000)
+    moments = stream_moments((x[i:i + 100], w[i:i + 100]) for i in range(0, 1000, 100))
+    n, std = weighted_moments(x, w)
+    assert moments["n_eff"] == pytest.approx(n)
+    assert moments["std"] == pytest.approx(std)
+
+
+@pytest.mark.parametrize("weights", [[1.0, -1.0, 2.0], [0.0, 0.0, 0.0]])
+def test_bad_weights_raise_on_every_path(weights):
+    x = np.array([1.0, 2.0, 3.0])
+    w = np.array(weights)
+    with pytest.raises(ValueError):
+        weighted_moments(x, w)
+    with pytest.raises(ValueError):
+        stream_moments([(x, w)])
+    if w.min() < 0:
+        with pytest.raises(ValueError):
+            stream_linear_binning([(x, w)], 0.0, 4.0, 16)
+
+
+def test_padded_counts_give_the_binned_kde_over_the_plot_range():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=5000)
+    lo, hi, h = x.min(), x.max(), 0.3
+    counts = linear_binning(x, lo, hi, 2048)
+    padded, new_lo, new_hi = pad_counts(counts, lo, hi, lo - 3 * h, hi + 3 * h)
+    assert new_lo <= lo - 3 * h and new_hi >= hi + 3 * h
+    grid = np.linspace(new_lo, new_hi, len(padded))
+    assert grid[1] - grid[0] == pytest.approx((hi - lo) / 2047)
+    density = binned_kde_from_counts(padded, new_lo, new_hi, h, "Gaussian")
+    exact = kde_func(grid, x, h, gaussian_kernel)
+    assert np.max(np.abs(density - exact)) < binning_error_bound("Gaussian", h, grid[1] - grid[0])
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from regression import IncrementalPolyFit
+
+
+def _r2(x, y, coef):
+    return 1 - np.sum((y - np.polyval(coef, x))**2) / np.sum((y - y.mean())**2)
+
+
+@pytest.mark.parametrize("degree", [1, 2, 3])
+def test_merged_fit_matches_polyfit(degree):
+    rng = np.random.default_rng(degree)
+    x = rng.uniform(-5, 20, 3000)
+    y = np.polyval(rng.normal(size=degree + 1), x) + rng.normal(0, 2, len(x))
+    expected = np.polyfit(x, y, degree)
+
+    # Workers on disjoint x ranges, each centred on its own first chunk
+    order = np.argsort(x)
+    parts = []
+    for idx in np.array_split(order, 4):
+        part = IncrementalPolyFit(degree)
+        for chunk in np.array_split(idx, 3):
+            part.update(x[chunk], y[chunk])
+        parts.append(part)
+    merged = IncrementalPolyFit(degree)
+    for part in parts:
+        merged.merge(part)
+
+    assert merged.n == len(x)
+    assert merged.coefficients() == pytest.approx(expected, rel=1e-8, abs=1e-10)
+    assert merged.r2() == pytest.approx(_r2(x, y, expected), rel=1e-10)
+
+
+def test_merge_rejects_other_degree():
+    with pytest.raises(ValueError):
+        IncrementalPolyFit(1).merge(IncrementalPolyFit(2).update([0.0, 1.0, 2.0], [1.0, 2.0, 5.0]))
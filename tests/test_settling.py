@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from settling import _INTERMEDIATE_HIGH, _NEWTON_LOW, g, settling_adaptive, settling_batch
+
+# Water at 20 °C
+RHO_F, MU = 1000.0, 1e-3
+
+
+# Diameters spanning the Stokes, intermediate and Newton regimes
+@pytest.mark.parametrize("rho_p", [1100.0, 2650.0, 7850.0])
+def test_batch_matches_adaptive(rho_p):
+    d = np.logspace(-6, -1, 40)
+    batch = settling_batch(d, rho_p, RHO_F, MU)
+    for i, d_m in enumerate(d):
+        expected = settling_adaptive(d_m, rho_p, RHO_F, MU)
+        for name in ("Re_p", "C_D", "v_t"):
+            assert batch[name][i] == pytest.approx(expected[name], rel=1e-9)
+        for name in ("t", "z"):
+            assert batch[name][i] == pytest.approx(expected[name], rel=1e-4)
+
+
+def test_batch_leaves_invalid_rows_nan():
+    batch = settling_batch([1e-4, -1e-4, 1e-4], [2650.0, 2650.0, 900.0], RHO_F, MU)
+    assert np.isfinite(batch.iloc[0]).all()
+    assert batch.iloc[1:].isna().all(axis=None)
+
+
+# A diameter whose force balance falls inside the C_D jump at Re_p = 1000, so
+# v_t sits on the jump: the acceleration drops from above accel_tol straight to
+# zero, and an event on the acceleration could stall the integrator (up to its
+# horizon) or stop it at the wrong time
+def test_adaptive_stops_on_drag_jump():
+    X = _INTERMEDIATE_HIGH + (_NEWTON_LOW - _INTERMEDIATE_HIGH) / 4  # C_D Re_p² inside the jump
+    rho_p = 2650.0
+    d_m = (X * MU**2 / (4 / 3 * RHO_F * (rho_p - RHO_F) * g)) ** (1 / 3)
+    result = settling_adaptive(d_m, rho_p, RHO_F, MU)
+    assert result["Re_p"] == pytest.approx(1000.0)
+    expected = settling_batch([d_m], rho_p, RHO_F, MU).iloc[0]
+    for name in ("t", "z"):
+        assert result[name] == pytest.approx(expected[name], rel=1e-4)
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from steam import P_MAX, P_MIN, SaturationTable, saturation_temperature
+
+
+# Verification values of the backward equation, Table 35 of IAPWS-IF97
+@pytest.mark.parametrize("pressure, t_sat", [(0.1e6, 0.372755919e3), (1e6, 0.453035632e3),
+                                             (10e6, 0.584149488e3)])
+def test_saturation_temperature_matches_iapws(pressure, t_sat):
+    assert saturation_temperature(pressure) == pytest.approx(t_sat, abs=1e-6)
+
+
+def test_saturation_temperature_is_nan_out_of_range():
+    assert np.isnan(saturation_temperature([P_MIN / 2, P_MAX * 1.01])).all()
+
+
+def test_table_within_its_error_bound():
+    table = SaturationTable()
+    # Well within the 1e-4 K quoted for batch runs
+    assert table.max_error < 1e-4
+    p = np.exp(np.random.default_rng(0).uniform(np.log(P_MIN), np.log(P_MAX), 100_000))
+    p = np.concatenate([p, [P_MIN, P_MAX]])
+    assert np.max(np.abs(table(p) - saturation_temperature(p))) <= table.max_error
@@ -0,0 +1,103 @@
+# Unit registry: every unit maps to (scale, offset) such that
+# value_SI = value * scale + offset. Only temperature needs a non-zero offset.
+UNITS = {
+    "length": {
+        "m": 1.0,
+        "micron": 1e-6,
+        "mm": 1e-3,
+        "cm": 1e-2,
+        "in": 0.0254,
+        "ft": 0.3048,
+    },
+    "mass": {
+        "kg": 1.0,
+        "g": 1e-3,
+        "lb": 0.45359237,
+    },
+    "density": {
+        "kg/m³": 1.0,
+        "g/cm³": 1000.0,
+        "lb/ft³": 16.01846337,
+    },
+    "volume": {
+        "m³": 1.0,
+        "cm³": 1e-6,
+        "in³": 0.0254 ** 3,
+        "ft³": 0.3048 ** 3,
+    },
+    "viscosity": {
+        "Pa·s": 1.0,
+        "cP": 1e-3,  # 1 cP = 0.001 Pa·s
+        "lb/ft·s": 1.488164,  # 1 lb/ft·s = 1.488164 Pa·s
+    },
+    "pressure": {
+        "Pa": 1.0,
+        "kPa": 1e3,
+        "bar": 1e5,
+        "MPa": 1e6,
+        "atm": 101325.0,
+        "psi": 6894.757293168,
+    },
+    "temperature": {
+        "K": (1.0, 0.0),
+        "°C": (1.0, 273.15),
+        "°F": (5 / 9, 273.15 - 32 * 5 / 9),
+    },
+    "time": {
+        "s": 1.0,
+        "min": 60.0,
+        "hr": 3600.0,
+    },
+    "velocity": {
+        "m/s": 1.0,
+        "cm/s": 1e-2,
+        "ft/s": 0.3048,
+    },
+}
+
+# Precomputed (scale, offset) tables in both directions, built once at import
+_TO_SI = {}
+_FROM_SI = {}
+for _dimension, _table in UNITS.items():
+    _TO_SI[_dimension] = {}
+    _FROM_SI[_dimension] = {}
+    for _unit, _factor in _table.items():
+        _scale, _offset = _factor if isinstance(_factor, tuple) else (_factor, 0.0)
+        _TO_SI[_dimension][_unit] = (_scale, _offset)
+        _FROM_SI[_dimension][_unit] = (1 / _scale, -_offset / _scale)
+
+
+def _lookup(tables, dimension, unit):
+    try:
+        return tables[dimension][unit]
+    except KeyError:
+        raise ValueError(f"Unknown {dimension} unit: {unit}") from None
+
+
+def _apply(value, scale, offset):
+    # One multiply-add; works for scalars and NumPy arrays / pandas Series alike
+    if offset:
+        return value * scale + offset
+    return value * scale if scale != 1.0 else value
+
+
+# SI unit of a dimension (the first entry of its table)
+def si_unit(dimension):
+    return next(iter(UNITS[dimension]))
+
+
+# Convert a value (scalar or array) in `unit` to SI
+def to_si(value, unit, dimension):
+    return _apply(value, *_lookup(_TO_SI, dimension, unit))
+
+
+# Convert a value (scalar or array) in SI to `unit`
+def from_si(value, unit, dimension):
+    return _apply(value, *_lookup(_FROM_SI, dimension, unit))
+
+
+# Convert directly between two units of the same dimension
+def convert(value, from_unit, to_unit, dimension):
+    scale_in, offset_in = _lookup(_TO_SI, dimension, from_unit)
+    scale_out, offset_out = _lookup(_FROM_SI, dimension, to_unit)
+    return _apply(value, scale_in * scale_out, offset_in * scale_out + offset_out)